@@ -110,6 +110,107 @@ export class Customer {
 }
 
 
+/*
+    Represents a table of a columnar MDB result set.
+    Records are created lazily on access and cached by their index.
+    Foreign keys are resolved to the referenced records if they are
+    contained in the result set and kept as IDs otherwise.
+*/
+export class ColumnarTable {
+    constructor (name, columns, references = {}, tables = {}) {
+        this.name = name;
+        this.columns = columns;
+        this.references = references;
+        this.tables = tables;
+        this.records = new Array(this.length);
+        this.indices = null;
+    }
+
+    get length () {
+        return this.columns.id.length;
+    }
+
+    get (index) {
+        let record = this.records[index];
+
+        if (record === undefined) {
+            this.records[index] = null;     // Breaks self-referencing cycles.
+            record = this.create(this.toJSON(index));
+            this.records[index] = record;
+        }
+
+        return record;
+    }
+
+    getById (id) {
+        if (id == null)
+            return null;
+
+        if (this.indices == null) {
+            this.indices = new Map();
+            this.columns.id.forEach((value, index) => this.indices.set(value, index));
+        }
+
+        const index = this.indices.get(id);
+        return (index === undefined) ? null : this.get(index);
+    }
+
+    toJSON (index) {
+        const json = {};
+
+        for (const [key, values] of Object.entries(this.columns))
+            json[key] = values[index];
+
+        return json;
+    }
+
+    resolve (key, id) {
+        const table = this.tables[this.references[key]];
+
+        if (table === undefined || id == null)
+            return id;
+
+        // Keep the ID of records which are not contained in the result set.
+        const record = table.getById(id);
+        return (record == null) ? id : record;
+    }
+
+    create (json) {
+        for (const key of Object.keys(this.references))
+            json[key] = this.resolve(key, json[key]);
+
+        switch (this.name) {
+        case 'address':
+            return Address.fromJSON(json);
+        case 'company':
+            return new Company(json.id, json.name, json.abbreviation, json.address);
+        case 'customer':
+            return new Customer(json.id, json.company);
+        default:
+            return json;
+        }
+    }
+
+    * [Symbol.iterator] () {
+        for (let index = 0; index < this.length; index++)
+            yield this.get(index);
+    }
+}
+
+
+/*
+    Decodes a columnar MDB result set into its lazily decoded root table.
+*/
+export function decodeColumnar (payload) {
+    const tables = {};
+
+    for (const [name, columns] of Object.entries(payload.tables))
+        tables[name] = new ColumnarTable(name, columns, payload.references[name], tables);
+
+    return tables[payload.root];
+}
+
+
 /*
     Converts a JSON object representing an address into a one-line string.
 */
@@ -10,6 +10,13 @@ from mdb.orm import Department
 from mdb.orm import Employee
 from mdb.orm import Tenement
 from mdb.parsers import customer
+from mdb.rows import AddressRow
+from mdb.rows import CompanyRow
+from mdb.rows import CustomerRow
+from mdb.rows import DepartmentRow
+from mdb.rows import EmployeeRow
+from mdb.rows import TenementRow
+from mdb.rows import rows
 from mdb.zip_codes import RANGES, STATES, ZIP_CODES, get_state
 
 
@@ -20,12 +27,19 @@ __all__ = [
     "ZIP_CODES",
     "AlreadyExists",
     "Address",
+    "AddressRow",
     "Company",
+    "CompanyRow",
     "Customer",
+    "CustomerRow",
     "Department",
+    "DepartmentRow",
     "Employee",
+    "EmployeeRow",
     "State",
     "Tenement",
+    "TenementRow",
     "customer",
     "get_state",
+    "rows",
 ]
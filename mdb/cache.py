@@ -0,0 +1,293 @@
+"""Generation-invalidated result cache for find() queries.
+
+Cached results are keyed by the model, the search pattern and the
+current generations of all tables involved in the query. Saving or
+deleting a record bumps its table's generation before and after the
+write, so that stale results are no longer hit and eventually evicted.
+Bumping after the write prevents results of concurrent queries, which
+still read the previous data, from being cached under the generation
+of the write. Within explicit transactions, the second bump happens
+before the commit, so call invalidate() with the affected tables after
+committing them.
+Queries and bulk updates or deletes bypassing the models' save() and
+delete_instance() methods do not bump the generations. Call invalidate()
+with the affected tables after committing them.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from fcntl import LOCK_EX, flock
+from hashlib import sha256
+from os import getuid, replace, scandir
+from pathlib import Path
+from pickle import dumps, loads
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Iterator, Optional, Union
+
+from peewee import Model, ModelSelect
+
+from mdb.orm import POST_DELETE, POST_SAVE, PRE_DELETE, PRE_SAVE, MDBModel
+from mdb.rows import Row, rows
+
+
+__all__ = [
+    "Backend",
+    "FileBackend",
+    "MemoryBackend",
+    "configure",
+    "invalidate",
+    "find",
+]
+
+
+MAX_SIZE = 64 * 1024 * 1024
+EVICTION_INTERVAL = 8
+
+
+class Backend(ABC):
+    """A cache backend storing pickled values and table generations."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the value stored for the key."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        """Stores the value for the key."""
+
+    @abstractmethod
+    def generation(self, table: str) -> int:
+        """Returns the current generation of the table."""
+
+    @abstractmethod
+    def bump(self, table: str) -> None:
+        """Increments the generation of the table."""
+
+
+class MemoryBackend(Backend):
+    """In-process LRU cache bounded by the size of the stored values.
+
+    The generations are local to the process, so writes of other
+    processes do not invalidate the cached results. Hence use it
+    only if all writes to the MDB go through this process.
+    """
+
+    def __init__(self, max_size: int = MAX_SIZE):
+        self.max_size = max_size
+        self.size = 0
+        self.values = OrderedDict()
+        self.generations = {}
+        self.lock = Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            if (value := self.values.get(key)) is not None:
+                self.values.move_to_end(key)
+
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_size:
+            return
+
+        with self.lock:
+            if (previous := self.values.pop(key, None)) is not None:
+                self.size -= len(previous)
+
+            self.values[key] = value
+            self.size += len(value)
+
+            while self.size > self.max_size:
+                _, evicted = self.values.popitem(last=False)
+                self.size -= len(evicted)
+
+    def generation(self, table: str) -> int:
+        return self.generations.get(table, 0)
+
+    def bump(self, table: str) -> None:
+        with self.lock:
+            self.generations[table] = self.generation(table) + 1
+
+
+class FileBackend(Backend):
+    """Cache in a local directory, which is shared among processes.
+
+    Use a directory on a tmpfs, e.g. below /dev/shm,
+    to keep the cache in shared memory.
+    Since the values are pickled, the directories must be owned by the
+    current user and must not be writable by others.
+    Each process evicts values whenever it has written another
+    1/EVICTION_INTERVAL of the size limit since its last eviction,
+    so the cache may temporarily exceed its size limit.
+    """
+
+    def __init__(self, directory: Union[Path, str], max_size: int = MAX_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.written = 0
+        self.values = self.directory / "values"
+        self.generations = self.directory / "generations"
+
+        for path in (self.directory, self.values, self.generations):
+            path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            _check_private(path)
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Atomically writes the data to the given file."""
+        with NamedTemporaryFile(
+            "wb", prefix=".tmp-", dir=path.parent, delete=False
+        ) as tmp:
+            tmp.write(data)
+
+        replace(tmp.name, path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Locks the generations across processes."""
+        with (self.directory / "lock").open("wb") as lock:
+            flock(lock, LOCK_EX)
+            yield
+
+    def _evict(self) -> None:
+        """Removes the least recently written values
+        until the cache's size limit is met.
+
+        Temporary files being written are skipped
+        as are values removed by other processes.
+        """
+        entries = []
+
+        for entry in scandir(self.values):
+            if entry.name.startswith("."):
+                continue
+
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()
+        size = sum(size for _, size, _ in entries)
+
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+
+            Path(path).unlink(missing_ok=True)
+            size -= entry_size
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return (self.values / sha256(key.encode()).hexdigest()).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_size:
+            return
+
+        self._write(self.values / sha256(key.encode()).hexdigest(), value)
+        self.written += len(value)
+
+        if self.written * EVICTION_INTERVAL >= self.max_size:
+            self.written = 0
+            self._evict()
+
+    def generation(self, table: str) -> int:
+        try:
+            return int((self.generations / table).read_text())
+        except FileNotFoundError:
+            return 0
+
+    def bump(self, table: str) -> None:
+        with self._locked():
+            generation = self.generation(table) + 1
+            self._write(self.generations / table, str(generation).encode())
+
+
+def _check_private(path: Path) -> None:
+    """Checks that the directory is owned by the
+    current user and not writable by others.
+    """
+
+    stat = path.stat()
+
+    if stat.st_uid != getuid() or stat.st_mode & 0o022:
+        raise PermissionError(f"Cache directory is not private: {path}")
+
+
+BACKEND: Optional[Backend] = None
+TABLES: dict[type[Model], list[str]] = {}
+
+
+def _bump(record: MDBModel, *_) -> None:
+    """Bumps the generation of the record's table."""
+
+    if BACKEND is not None:
+        BACKEND.bump(record._meta.table_name)
+
+
+def invalidate(*tables: str) -> None:
+    """Bumps the generations of the given tables."""
+
+    if BACKEND is not None:
+        for table in tables:
+            BACKEND.bump(table)
+
+
+def configure(backend: Optional[Backend]) -> None:
+    """Configures the cache backend.
+
+    Processes writing to the MDB must configure the same shared
+    backend to invalidate cached results, i.e. a FileBackend on the
+    same directory. A MemoryBackend is only suitable if all writes
+    go through the configuring process.
+    Passing None disables the cache.
+    """
+
+    global BACKEND  # pylint: disable=W0603
+    BACKEND = backend
+
+    for hooks in (PRE_SAVE, POST_SAVE, PRE_DELETE, POST_DELETE):
+        if _bump not in hooks:
+            hooks.append(_bump)
+
+
+def _tables(select: ModelSelect) -> list[str]:
+    """Returns the names of the tables involved in the select."""
+
+    if (tables := TABLES.get(select.model)) is None:
+        tables = TABLES[select.model] = sorted(
+            {
+                getattr(column.model, "model", column.model)._meta.table_name
+                for column in select.selected_columns
+            }
+        )
+
+    return tables
+
+
+def find(model: type[Model], pattern: str) -> list[Row]:
+    """Returns the rows of the model's find() query
+    for the given pattern from the cache, if possible.
+    """
+
+    select = model.find(pattern)
+
+    if BACKEND is None:
+        return list(rows(select))
+
+    generations = [(table, BACKEND.generation(table)) for table in _tables(select)]
+    key = repr((model._meta.table_name, pattern, generations))
+
+    if (value := BACKEND.get(key)) is not None:
+        return loads(value)
+
+    result = list(rows(select))
+    BACKEND.set(key, dumps(result))
+    return result
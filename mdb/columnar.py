@@ -0,0 +1,124 @@
+"""Columnar bulk wire format of MDB result sets.
+
+The format stores each table's key names once and its values as column
+arrays. Related records are deduplicated by their ID into separate tables
+and referenced by the foreign key columns:
+
+    {
+        "root": "customer",
+        "tables": {
+            "customer": {"id": [...], "company": [...], ...},
+            "company": {"id": [...], "name": [...], "address": [...], ...},
+            "address": {"id": [...], "street": [...], ...}
+        },
+        "references": {
+            "customer": {"company": "company"},
+            "company": {"address": "address"},
+            "address": {}
+        }
+    }
+"""
+
+from __future__ import annotations
+from operator import attrgetter
+from typing import Any, Iterable
+
+from peewee import ForeignKeyField, Model, ModelSelect
+
+from mdb.rows import rows
+from mdb.serialization import attribute, encode, json_key
+
+
+__all__ = ["dumps", "to_columns"]
+
+
+class Table:
+    """Column arrays of a table's records."""
+
+    def __init__(self, model: type[Model]):
+        self.model = model
+        self.keys = [json_key(field) for field in model._meta.sorted_fields]
+        self.getter = attrgetter(*map(attribute, model._meta.sorted_fields))
+        self.columns = [[] for _ in self.keys]
+        self.ids = set()
+
+    def add(self, record: Any) -> bool:
+        """Adds a record unless it already exists.
+        Returns True iff the record was added.
+        """
+        if record.id in self.ids:
+            return False
+
+        self.ids.add(record.id)
+
+        for column, value in zip(self.columns, self.getter(record)):
+            column.append(value)
+
+        return True
+
+    def to_json(self) -> dict[str, list]:
+        """Returns a dict of the column arrays."""
+        return dict(zip(self.keys, self.columns))
+
+
+def _related(model: type[Model]) -> list[ForeignKeyField]:
+    """Returns the foreign keys of the given model."""
+
+    return [
+        field
+        for field in model._meta.sorted_fields
+        if isinstance(field, ForeignKeyField)
+    ]
+
+
+def _add(tables: dict[type[Model], Table], model: type[Model], record: Any) -> None:
+    """Adds the record and its selected related records to the tables."""
+
+    if (table := tables.get(model)) is None:
+        table = tables[model] = Table(model)
+
+    if not table.add(record):
+        return
+
+    for field in _related(model):
+        related = getattr(record, field.name, None)
+
+        # Unselected related records are represented by their ID.
+        if related is None or isinstance(related, int):
+            continue
+
+        _add(tables, field.rel_model, related)
+
+
+def to_columns(records: Iterable[Any], model: type[Model]) -> dict:
+    """Converts records of the given model into the columnar format."""
+
+    tables = {model: Table(model)}
+
+    for record in records:
+        _add(tables, model, record)
+
+    return {
+        "root": model._meta.table_name,
+        "tables": {
+            table.model._meta.table_name: table.to_json() for table in tables.values()
+        },
+        "references": {
+            table.model._meta.table_name: {
+                json_key(field): field.rel_model._meta.table_name
+                for field in _related(table.model)
+                if field.rel_model in tables
+            }
+            for table in tables.values()
+        },
+    }
+
+
+def dumps(select: ModelSelect) -> bytes:
+    """Serializes a whole result set into the columnar format.
+
+    The select must have been created by the respective model's
+    select() method, with cascading if related records shall be included.
+    """
+
+    return encode(to_columns(rows(select), select.model))
@@ -0,0 +1,130 @@
+"""Reverse lookup of employees by phone numbers and email addresses."""
+
+from __future__ import annotations
+from re import sub
+from threading import Lock
+from time import monotonic
+from typing import Iterable, Optional
+
+from mdb.orm import Employee
+from mdb.rows import EmployeeRow, rows
+
+
+__all__ = ["ContactIndex", "normalize_email", "normalize_phone"]
+
+
+COUNTRY_CODE = "49"
+PHONE_FIELDS = ("phone", "cellphone", "phone_alt", "fax")
+
+
+def normalize_phone(number: str, country_code: str = COUNTRY_CODE) -> Optional[str]:
+    """Normalizes a free-form phone number into E.164 format.
+
+    National numbers are assumed to belong to the given country.
+    Returns None if the string does not contain a phone number.
+    """
+
+    number = number.strip()
+    international = number.startswith("+")
+    # Strip optional trunk prefixes, e.g. "+49 (0) 511 ...".
+    digits = sub(r"\D", "", sub(r"\(0\)", "", number))
+
+    if not digits:
+        return None
+
+    if international:
+        return f"+{digits}"
+
+    if digits.startswith("00"):
+        return f"+{digits[2:]}"
+
+    if digits.startswith("0"):
+        return f"+{country_code}{digits[1:]}"
+
+    return f"+{country_code}{digits}"
+
+
+def normalize_email(email: str) -> Optional[str]:
+    """Normalizes an email address."""
+
+    return email.strip().casefold() or None
+
+
+class ContactIndex:
+    """In-memory reverse index of the employees' phone numbers
+    and email addresses, which is refreshed after a time to live.
+    """
+
+    def __init__(self, ttl: float = 300, country_code: str = COUNTRY_CODE):
+        self.ttl = ttl
+        self.country_code = country_code
+        self.phones = {}
+        self.emails = {}
+        self.timestamp = None
+        self.lock = Lock()
+
+    def _index(self, employees: Iterable[EmployeeRow]) -> None:
+        """Builds the index from the given employees."""
+        phones = {}
+        emails = {}
+
+        for employee in employees:
+            numbers = {
+                normalize_phone(number, self.country_code)
+                for field in PHONE_FIELDS
+                if (number := getattr(employee, field))
+            }
+            numbers.discard(None)
+
+            for number in numbers:
+                phones.setdefault(number, []).append(employee)
+
+            if employee.email and (email := normalize_email(employee.email)):
+                emails.setdefault(email, []).append(employee)
+
+        self.phones, self.emails = phones, emails
+
+    def _rebuild(self) -> None:
+        """Rebuilds the index from the database while holding the lock."""
+        self._index(rows(Employee.select(cascade=True)))
+        self.timestamp = monotonic()
+
+    def _expired(self) -> bool:
+        """Determines whether the index has expired."""
+        return self.timestamp is None or monotonic() - self.timestamp > self.ttl
+
+    def refresh(self) -> None:
+        """Rebuilds the index from the database."""
+        with self.lock:
+            self._rebuild()
+
+    def _refresh_if_expired(self) -> None:
+        """Refreshes the index if it has expired.
+
+        Callers which waited for a concurrent refresh
+        use its result instead of rebuilding the index again.
+        """
+        if not self._expired():
+            return
+
+        with self.lock:
+            if self._expired():
+                self._rebuild()
+
+    def by_phone(self, number: str) -> list[EmployeeRow]:
+        """Returns the employees with the given phone number."""
+        self._refresh_if_expired()
+
+        if (number := normalize_phone(number, self.country_code)) is None:
+            return []
+
+        return self.phones.get(number, [])
+
+    def by_email(self, email: str) -> list[EmployeeRow]:
+        """Returns the employees with the given email address."""
+        self._refresh_if_expired()
+
+        if (email := normalize_email(email)) is None:
+            return []
+
+        return self.emails.get(email, [])
@@ -0,0 +1,179 @@
+"""Merging of duplicate addresses."""
+
+from __future__ import annotations
+from logging import getLogger
+from time import sleep
+from typing import Iterator, NamedTuple
+
+from peewee import Case, ForeignKeyField, fn
+
+from mdb.cache import invalidate
+from mdb.orm import Address
+from mdb.orm import Company
+from mdb.orm import Employee
+from mdb.orm import Tenement
+from mdb.summary import CustomerSummary, refresh_addresses
+
+
+__all__ = ["REFERENCES", "Report", "duplicates", "merge_addresses"]
+
+
+LOGGER = getLogger("mdb.dedupe")
+BATCH_SIZE = 500
+PAUSE = 0.5
+REFERENCES = [Company.address, Employee.address, Tenement.address]
+
+
+class Report(NamedTuple):
+    """Report of an address merge."""
+
+    groups: int
+    duplicates: int
+    references: dict[str, int]
+    dry_run: bool
+
+    @property
+    def lines(self) -> Iterator[str]:
+        """Yields lines for a human-readable report."""
+        action = "Would repoint" if self.dry_run else "Repointed"
+        yield f"Duplicate groups:    {self.groups}"
+        yield f"Duplicate addresses: {self.duplicates}"
+
+        for field, count in self.references.items():
+            yield f"{action} {count} references of {field}."
+
+        action = "Would delete" if self.dry_run else "Deleted"
+        yield f"{action} {self.duplicates} addresses."
+
+
+def duplicates() -> dict[int, list[int]]:
+    """Returns the IDs of duplicate addresses by the ID of the canonical
+    address, which is the one with the lowest ID in its group.
+    """
+
+    columns = [
+        Address.street,
+        Address.house_number,
+        Address.zip_code,
+        Address.city,
+        Address.district,
+    ]
+    groups = (
+        Address.select(fn.MIN(Address.id).alias("canonical"), *columns)
+        .group_by(*columns)
+        .having(fn.COUNT(Address.id) > 1)
+        .alias("groups")
+    )
+    condition = (
+        (Address.street == groups.c.street)
+        & (Address.house_number == groups.c.house_number)
+        & (Address.zip_code == groups.c.zip_code)
+        & (Address.city == groups.c.city)
+        & (
+            (Address.district == groups.c.district)
+            | (Address.district.is_null() & groups.c.district.is_null())
+        )
+    )
+    select = (
+        Address.select(Address.id, groups.c.canonical)
+        .join(groups, on=condition)
+        .where(Address.id != groups.c.canonical)
+        .tuples()
+    )
+    result = {}
+
+    for ident, canonical in select:
+        result.setdefault(canonical, []).append(ident)
+
+    return result
+
+
+def _batches(groups: dict[int, list[int]], size: int) -> Iterator[dict[int, int]]:
+    """Yields mappings of duplicate to canonical IDs with up
+    to the given amount of duplicates, keeping groups together.
+    """
+
+    batch = {}
+
+    for canonical, idents in groups.items():
+        batch.update((ident, canonical) for ident in idents)
+
+        if len(batch) >= size:
+            yield batch
+            batch = {}
+
+    if batch:
+        yield batch
+
+
+def _name(field: ForeignKeyField) -> str:
+    """Returns the qualified name of the field."""
+
+    return f"{field.model.__name__}.{field.name}"
+
+
+def _count(field: ForeignKeyField, batch: dict[int, int]) -> int:
+    """Counts the references to the duplicates."""
+
+    return field.model.select().where(field << list(batch)).count()
+
+
+def _repoint(field: ForeignKeyField, batch: dict[int, int]) -> int:
+    """Repoints the references to the canonical addresses."""
+
+    canonical = Case(field, list(batch.items()))
+    update = field.model.update({field: canonical}).where(field << list(batch))
+    return update.execute()
+
+
+def merge_addresses(
+    *,
+    batch_size: int = BATCH_SIZE,
+    pause: float = PAUSE,
+    dry_run: bool = False,
+) -> Report:
+    """Merges duplicate addresses.
+
+    References to duplicates are repointed to the canonical address and
+    the duplicates are deleted afterwards. Each batch of duplicates is
+    processed in its own transaction, followed by a pause to throttle
+    the load on the database. Since the bulk queries bypass the models'
+    hooks, the cached results of the affected tables are invalidated
+    after each transaction. This requires the shared cache backend to
+    be configured, e.g. via the --cache-dir option of the mdbmgr.
+    If the customer summary exists, the summaries referencing the
+    duplicates are refreshed within the respective transaction.
+    """
+
+    summarized = not dry_run and CustomerSummary.table_exists()
+    groups = duplicates()
+    references = {_name(field): 0 for field in REFERENCES}
+    amount = 0
+
+    for batch in _batches(groups, batch_size):
+        with Address._meta.database.atomic():
+            for field in REFERENCES:
+                if dry_run:
+                    references[_name(field)] += _count(field, batch)
+                else:
+                    references[_name(field)] += _repoint(field, batch)
+
+            if summarized:
+                refresh_addresses(*batch)
+
+            if not dry_run:
+                Address.delete().where(Address.id << list(batch)).execute()
+
+        if not dry_run:
+            invalidate(
+                Address._meta.table_name,
+                *(field.model._meta.table_name for field in REFERENCES),
+            )
+
+        amount += len(batch)
+        LOGGER.info("Processed %i duplicate addresses.", amount)
+
+        if not dry_run:
+            sleep(pause)
+
+    return Report(len(groups), amount, references, dry_run)
@@ -0,0 +1,280 @@
+"""Stream of change events emitted by writes through the models.
+
+Saving or deleting a record emits a change event with its table, ID and
+the names of the changed fields. Events are buffered and handed to the
+configured sink in batches. Since events are emitted after the write
+but not necessarily after the transaction has been committed, consumers
+should treat them as hints to re-read the respective records.
+Queries and bulk updates or deletes bypassing the models' save() and
+delete_instance() methods do not emit events.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from atexit import register
+from contextlib import suppress
+from fcntl import LOCK_EX, flock
+from json import loads
+from os import replace
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock, Timer
+from time import sleep, time
+from typing import Callable, Iterator, NamedTuple, Optional, Sequence, Union
+
+from mdb.orm import POST_DELETE, POST_SAVE, MDBModel
+from mdb.serialization import encode
+
+
+__all__ = [
+    "ChangeEvent",
+    "Sink",
+    "LogSink",
+    "QueueSink",
+    "configure",
+    "flush",
+    "tail",
+    "consume",
+]
+
+
+BATCH_SIZE = 100
+MAX_DELAY = 1.0
+INTERVAL = 1.0
+
+
+class ChangeEvent(NamedTuple):
+    """A change of a record."""
+
+    table: str
+    id: int
+    action: str
+    fields: tuple[str, ...]
+    timestamp: float
+
+    @classmethod
+    def from_json(cls, json: dict) -> ChangeEvent:
+        """Creates a change event from a JSON-ish dict."""
+        return cls(
+            json["table"],
+            json["id"],
+            json["action"],
+            tuple(json["fields"]),
+            json["timestamp"],
+        )
+
+    def to_json(self) -> dict:
+        """Returns a JSON-ish dict."""
+        return self._asdict()
+
+
+class Sink(ABC):
+    """A receiver of batches of change events."""
+
+    @abstractmethod
+    def write(self, events: Sequence[ChangeEvent]) -> None:
+        """Writes the batch of events."""
+
+
+class LogSink(Sink):
+    """Appends the events as JSON lines to a local log file,
+    which may be shared among processes.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        self.path = Path(path)
+
+    def write(self, events: Sequence[ChangeEvent]) -> None:
+        data = b"".join(encode(event.to_json()) + b"\n" for event in events)
+
+        with self.path.open("ab") as file:
+            flock(file, LOCK_EX)
+            file.write(data)
+
+
+class QueueSink(Sink):
+    """Puts the events into a queue, e.g. a queue.Queue
+    or a multiprocessing.Queue.
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    def write(self, events: Sequence[ChangeEvent]) -> None:
+        for event in events:
+            self.queue.put(event)
+
+
+SINK: Optional[Sink] = None
+BUFFER: list[ChangeEvent] = []
+LOCK = Lock()
+SETTINGS = {"batch_size": BATCH_SIZE, "max_delay": MAX_DELAY}
+TIMER: Optional[Timer] = None
+
+
+def flush() -> None:
+    """Writes the buffered events to the sink."""
+
+    global TIMER  # pylint: disable=W0603
+
+    with LOCK:
+        events = BUFFER.copy()
+        BUFFER.clear()
+
+        if TIMER is not None:
+            TIMER.cancel()
+            TIMER = None
+
+    if events and SINK is not None:
+        SINK.write(events)
+
+
+def _emit(event: ChangeEvent) -> None:
+    """Buffers the event and flushes the buffer if the batch is complete.
+
+    The first buffered event arms a timer, which
+    flushes the buffer after the maximum delay.
+    """
+
+    global TIMER  # pylint: disable=W0603
+
+    if SINK is None:
+        return
+
+    with LOCK:
+        BUFFER.append(event)
+        due = len(BUFFER) >= SETTINGS["batch_size"]
+
+        if not due and TIMER is None:
+            TIMER = Timer(SETTINGS["max_delay"], flush)
+            TIMER.daemon = True
+            TIMER.start()
+
+    if due:
+        flush()
+
+
+def _saved(record: MDBModel, fields: frozenset[str]) -> None:
+    """Emits a change event for the saved record."""
+
+    _emit(
+        ChangeEvent(
+            record._meta.table_name,
+            record.get_id(),
+            "save",
+            tuple(sorted(fields)),
+            time(),
+        )
+    )
+
+
+def _deleted(record: MDBModel) -> None:
+    """Emits a change event for the deleted record."""
+
+    _emit(ChangeEvent(record._meta.table_name, record.get_id(), "delete", (), time()))
+
+
+def configure(
+    sink: Optional[Sink],
+    *,
+    batch_size: int = BATCH_SIZE,
+    max_delay: float = MAX_DELAY,
+) -> None:
+    """Configures the sink of the change events.
+
+    Events are buffered until the batch size is reached or the oldest
+    buffered event is older than the maximum delay in seconds.
+    Remaining events are flushed on exit or by calling flush().
+    Passing None disables the events.
+    """
+
+    global SINK  # pylint: disable=W0603
+    flush()
+    SINK = sink
+    SETTINGS["batch_size"] = batch_size
+    SETTINGS["max_delay"] = max_delay
+
+    if _saved not in POST_SAVE:
+        POST_SAVE.append(_saved)
+
+    if _deleted not in POST_DELETE:
+        POST_DELETE.append(_deleted)
+
+
+register(flush)
+
+
+def tail(
+    path: Union[Path, str],
+    offset: int = 0,
+    *,
+    follow: bool = True,
+    interval: float = INTERVAL,
+) -> Iterator[tuple[ChangeEvent, int]]:
+    """Yields the events of a log file starting at the given offset
+    along with the offset after the respective event.
+
+    If follow is True, waits for new events,
+    polling the file in the given interval.
+    """
+
+    with Path(path).open("rb") as file:
+        file.seek(offset)
+
+        while True:
+            line = file.readline()
+
+            if line.endswith(b"\n"):
+                offset += len(line)
+                yield ChangeEvent.from_json(loads(line)), offset
+                continue
+
+            # Wait for incomplete lines to be written completely.
+            file.seek(offset)
+
+            if not follow:
+                return
+
+            sleep(interval)
+
+
+def _read_offset(checkpoint: Path) -> int:
+    """Reads the offset from the checkpoint file."""
+
+    with suppress(FileNotFoundError):
+        return int(checkpoint.read_text())
+
+    return 0
+
+
+def _write_offset(checkpoint: Path, offset: int) -> None:
+    """Atomically writes the offset to the checkpoint file."""
+
+    with NamedTemporaryFile("w", dir=checkpoint.parent, delete=False) as tmp:
+        tmp.write(str(offset))
+
+    replace(tmp.name, checkpoint)
+
+
+def consume(
+    path: Union[Path, str],
+    handler: Callable[[ChangeEvent], None],
+    checkpoint: Optional[Union[Path, str]] = None,
+    *,
+    follow: bool = True,
+    interval: float = INTERVAL,
+) -> None:
+    """Tails the log file and applies the events using the handler.
+
+    If a checkpoint file is given, consumption resumes at the offset
+    stored in it, which is updated after each handled event.
+    """
+
+    checkpoint = None if checkpoint is None else Path(checkpoint)
+    offset = 0 if checkpoint is None else _read_offset(checkpoint)
+
+    for event, offset in tail(path, offset, follow=follow, interval=interval):
+        handler(event)
+
+        if checkpoint is not None:
+            _write_offset(checkpoint, offset)
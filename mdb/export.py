@@ -0,0 +1,191 @@
+"""Streaming XML export as described by doc/crm.xsd.
+
+The documents are written element by element from the rows of a cascaded
+select, so that the memory usage does not depend on the size of the table.
+Since the MySQL client buffers the complete result set of a query even
+when iterating it, the rows are read in pages of PAGE_SIZE records using
+keyset pagination, i.e. ordered by ID and starting after the last ID of
+the previous page. Hence the select's own order and limit are ignored.
+Since the schema's root element is a choice, each document contains the
+records of a single table only.
+The schema does not define departments and employees yet. They are
+exported like the defined types, i.e. with the ID as attribute, their
+fields as child elements and the related records nested.
+"""
+
+from __future__ import annotations
+from io import BufferedWriter
+from typing import BinaryIO, Callable, Iterator, Optional
+from xml.sax.saxutils import XMLGenerator
+from xml.sax.xmlreader import AttributesImpl
+
+from peewee import Model, ModelSelect
+
+from mdb.orm import Address
+from mdb.orm import Company
+from mdb.orm import Customer
+from mdb.orm import Department
+from mdb.orm import Employee
+from mdb.rows import AddressRow
+from mdb.rows import CompanyRow
+from mdb.rows import CustomerRow
+from mdb.rows import DepartmentRow
+from mdb.rows import EmployeeRow
+from mdb.rows import Row
+from mdb.rows import rows
+
+
+__all__ = ["NAMESPACE", "MODELS", "export"]
+
+
+NAMESPACE = "http://xml.homeinfo.de/schema/crm"
+ROOT = "homeinfocrm"
+BUFFER_SIZE = 64 * 1024
+PAGE_SIZE = 1000
+
+
+def _text(writer: XMLGenerator, name: str, value: Optional[object]) -> None:
+    """Writes an element with the value as text, unless it is None."""
+
+    if value is None:
+        return
+
+    writer.startElement(name, AttributesImpl({}))
+    writer.characters(str(value))
+    writer.endElement(name)
+
+
+def _start(writer: XMLGenerator, name: str, row: Row) -> None:
+    """Starts an element with the row's ID as attribute."""
+
+    writer.startElement(name, AttributesImpl({"id": str(row.id)}))
+
+
+def _address(writer: XMLGenerator, address: AddressRow) -> None:
+    """Writes an address element."""
+
+    _start(writer, "address", address)
+    _text(writer, "street", address.street)
+    _text(writer, "house_number", address.house_number)
+    _text(writer, "zip_code", address.zip_code)
+    _text(writer, "city", address.city)
+    _text(writer, "state", address.state_name)
+    writer.endElement("address")
+
+
+def _company(writer: XMLGenerator, company: CompanyRow) -> None:
+    """Writes a company element."""
+
+    _start(writer, "company", company)
+    _text(writer, "name", company.name)
+
+    if company.address is not None:
+        _address(writer, company.address)
+
+    _text(writer, "annotation", company.annotation)
+    writer.endElement("company")
+
+
+def _customer(writer: XMLGenerator, customer: CustomerRow) -> None:
+    """Writes a customer element."""
+
+    _start(writer, "customer", customer)
+    _company(writer, customer.company)
+    writer.endElement("customer")
+
+
+def _department(writer: XMLGenerator, department: DepartmentRow) -> None:
+    """Writes a department element."""
+
+    _start(writer, "department", department)
+    _text(writer, "name", department.name)
+    _text(writer, "type", department.type)
+    writer.endElement("department")
+
+
+def _employee(writer: XMLGenerator, employee: EmployeeRow) -> None:
+    """Writes an employee element."""
+
+    _start(writer, "employee", employee)
+    _company(writer, employee.company)
+    _department(writer, employee.department)
+    _text(writer, "first_name", employee.first_name)
+    _text(writer, "surname", employee.surname)
+    _text(writer, "phone", employee.phone)
+    _text(writer, "cellphone", employee.cellphone)
+    _text(writer, "email", employee.email)
+    _text(writer, "phone_alt", employee.phone_alt)
+    _text(writer, "fax", employee.fax)
+
+    if employee.address is not None:
+        _address(writer, employee.address)
+
+    writer.endElement("employee")
+
+
+WRITERS: dict[type[Model], Callable[[XMLGenerator, Row], None]] = {
+    Address: _address,
+    Company: _company,
+    Customer: _customer,
+    Department: _department,
+    Employee: _employee,
+}
+MODELS = list(WRITERS)
+
+
+def _pages(select: ModelSelect, page_size: int) -> Iterator[Row]:
+    """Yields the rows of the select ordered by ID,
+    querying pages of the given size.
+    """
+
+    primary_key = select.model._meta.primary_key
+    select = select.order_by(primary_key).limit(page_size)
+    page = select
+
+    while True:
+        count = 0
+
+        for count, row in enumerate(rows(page), start=1):
+            yield row
+
+        if count < page_size:
+            return
+
+        page = select.where(primary_key > getattr(row, primary_key.name))
+
+
+def export(
+    select: ModelSelect,
+    file: BinaryIO,
+    *,
+    buffer_size: int = BUFFER_SIZE,
+    page_size: int = PAGE_SIZE,
+) -> int:
+    """Writes the records of the cascaded select as
+    CRM XML document to the binary file.
+
+    Returns the amount of exported records.
+    """
+
+    if (write := WRITERS.get(select.model)) is None:
+        raise ValueError(f"Cannot export {select.model.__name__} records.")
+
+    buffer = BufferedWriter(file, buffer_size)
+    writer = XMLGenerator(buffer, encoding="utf-8", short_empty_elements=True)
+    count = 0
+
+    try:
+        writer.startDocument()
+        writer.startElement(ROOT, AttributesImpl({"xmlns": NAMESPACE}))
+
+        for count, row in enumerate(_pages(select, page_size), start=1):
+            write(writer, row)
+
+        writer.endElement(ROOT)
+        writer.endDocument()
+        buffer.flush()
+    finally:
+        # Do not close the file when the buffer is garbage collected.
+        buffer.detach()
+
+    return count
@@ -0,0 +1,33 @@
+"""Common functions."""
+
+from typing import Iterable, Iterator, TypeVar
+
+from peewee import Database, MySQLDatabase
+
+
+__all__ = ["batches", "is_mysql"]
+
+
+Item = TypeVar("Item")
+
+
+def batches(items: Iterable[Item], size: int) -> Iterator[list[Item]]:
+    """Yields lists of up to the given amount of items."""
+
+    batch = []
+
+    for item in items:
+        batch.append(item)
+
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def is_mysql(database: Database) -> bool:
+    """Determines whether the database, or the one it proxies, is MySQL."""
+
+    return isinstance(getattr(database, "obj", database), MySQLDatabase)
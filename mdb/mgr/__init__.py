@@ -1,7 +1,6 @@
 """Datamase management utility."""
 
-from mdb.mgr.argparse import get_args
-from mdb.mgr.functions import find_recods
+from mdb.mgr.commands import run
 
 
 __all__ = ["main"]
@@ -10,8 +9,4 @@ __all__ = ["main"]
 def main() -> None:
     """Runs the crmgr."""
 
-    args = get_args()
-
-    if args.action == "find":
-        for record in find_recods(args):
-            print(*record.to_csv(), sep="\t")
+    run()
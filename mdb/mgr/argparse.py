@@ -1,9 +1,20 @@
 """Argument parser for the mdbmgr."""
 
-from argparse import ArgumentParser, Namespace, _SubParsersAction
+from argparse import ArgumentParser, ArgumentTypeError, Namespace, _SubParsersAction
+from pathlib import Path
+from typing import Optional, Sequence
 
 
-__all__ = ["get_args"]
+__all__ = ["get_args", "get_parser"]
+
+
+def _positive_int(value: str) -> int:
+    """Parses a positive integer."""
+
+    if (number := int(value)) < 1:
+        raise ArgumentTypeError(f"must be at least 1: {value}")
+
+    return number
 
 
 def _add_find_address_parser(subparsers: _SubParsersAction):
@@ -74,6 +85,12 @@ def _add_find_parsers(subparsers: _SubParsersAction):
     """Adds parsers for the find command."""
 
     parser = subparsers.add_parser("find", help="find database records")
+    parser.add_argument(
+        "--explain", action="store_true", help="print the SQL and query plan"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="print profiling information"
+    )
     subparsers = parser.add_subparsers(dest="table")
     _add_find_address_parser(subparsers)
     _add_find_company_parser(subparsers)
@@ -82,11 +99,152 @@ def _add_find_parsers(subparsers: _SubParsersAction):
     _add_find_employee_parser(subparsers)
     _add_find_tenement_parser(subparsers)
 
-
-def get_args() -> Namespace:
-    """Parses the command line arguments."""
-
-    parser = ArgumentParser(description="Main database management utility.")
+    for parser in subparsers.choices.values():
+        parser.add_argument(
+            "--format", choices=["tsv", "jsonl"], default="tsv", help="output format"
+        )
+
+
+def _add_benchmark_parsers(subparsers: _SubParsersAction):
+    """Adds parsers for the benchmark command."""
+
+    parser = subparsers.add_parser("benchmark", help="benchmark database access")
+    subparsers = parser.add_subparsers(dest="benchmark")
+    parser = subparsers.add_parser("cascade", help="compare cascading strategies")
+    parser.add_argument(
+        "table", choices=["company", "customer", "employee", "tenement"]
+    )
+    parser.add_argument(
+        "-r", "--repetitions", type=_positive_int, default=1, metavar="n"
+    )
+
+
+def _add_export_parser(subparsers: _SubParsersAction):
+    """Adds a parser for the export command."""
+
+    parser = subparsers.add_parser("export", help="export records as CRM XML")
+    parser.add_argument(
+        "table", choices=["address", "company", "customer", "department", "employee"]
+    )
+    parser.add_argument(
+        "file", type=Path, nargs="?", help="the XML file, defaults to stdout"
+    )
+
+
+def _add_snapshot_parser(subparsers: _SubParsersAction):
+    """Adds a parser for the snapshot command."""
+
+    parser = subparsers.add_parser("snapshot", help="build a customer snapshot")
+    parser.add_argument("file", type=Path, help="the snapshot file")
+
+
+def _add_summary_parser(subparsers: _SubParsersAction):
+    """Adds a parser for the summary command."""
+
+    parser = subparsers.add_parser("summary", help="manage the customer summary")
+    parser.add_argument(
+        "summary", choices=["rebuild"], help="rebuild the customer summary"
+    )
+
+
+def _add_sync_parser(subparsers: _SubParsersAction):
+    """Adds a parser for the sync command."""
+
+    parser = subparsers.add_parser("sync", help="sync tables to a replica")
+    parser.add_argument("target", metavar="url", help="the target database URL")
+    parser.add_argument(
+        "-t",
+        "--table",
+        action="append",
+        choices=[
+            "address",
+            "company",
+            "department",
+            "employee",
+            "customer",
+            "tenement",
+        ],
+        dest="tables",
+        help="tables to sync",
+    )
+    parser.add_argument(
+        "-l", "--leaf-size", type=_positive_int, default=256, metavar="n"
+    )
+    parser.add_argument(
+        "-b", "--batch-size", type=_positive_int, default=1000, metavar="n"
+    )
+    parser.add_argument("-n", "--dry-run", action="store_true")
+
+
+def _add_schema_parser(subparsers: _SubParsersAction):
+    """Adds a parser for the schema command."""
+
+    parser = subparsers.add_parser("schema", help="manage indexes")
+    parser.add_argument(
+        "schema",
+        choices=["check", "apply"],
+        help="check for or create missing indexes",
+    )
+
+
+def _add_dedupe_parsers(subparsers: _SubParsersAction):
+    """Adds parsers for the dedupe command."""
+
+    parser = subparsers.add_parser("dedupe", help="merge duplicate records")
+    subparsers = parser.add_subparsers(dest="dedupe")
+    parser = subparsers.add_parser("addresses", help="merge duplicate addresses")
+    parser.add_argument(
+        "-b", "--batch-size", type=_positive_int, default=500, metavar="n"
+    )
+    parser.add_argument("-p", "--pause", type=float, default=0.5, metavar="seconds")
+    parser.add_argument("-n", "--dry-run", action="store_true")
+    parser.add_argument(
+        "-c",
+        "--cache-dir",
+        type=Path,
+        metavar="path",
+        help="directory of the shared find() cache to invalidate",
+    )
+
+
+def _add_serve_parser(subparsers: _SubParsersAction):
+    """Adds a parser for the serve command."""
+
+    parser = subparsers.add_parser("serve", help="serve find requests")
+    parser.add_argument(
+        "-s",
+        "--socket",
+        type=Path,
+        metavar="path",
+        help="listen on a Unix socket instead of stdin",
+    )
+    parser.add_argument("-w", "--workers", type=_positive_int, default=4, metavar="n")
+
+
+def get_parser(parser_class: type[ArgumentParser] = ArgumentParser) -> ArgumentParser:
+    """Returns the argument parser.
+
+    The subparsers are of the same class as the given parser class.
+    """
+
+    parser = parser_class(description="Main database management utility.")
     subparsers = parser.add_subparsers(dest="action")
     _add_find_parsers(subparsers)
-    return parser.parse_args()
+    _add_benchmark_parsers(subparsers)
+    _add_dedupe_parsers(subparsers)
+    _add_export_parser(subparsers)
+    _add_snapshot_parser(subparsers)
+    _add_schema_parser(subparsers)
+    _add_serve_parser(subparsers)
+    _add_summary_parser(subparsers)
+    _add_sync_parser(subparsers)
+    return parser
+
+
+def get_args(
+    argv: Optional[Sequence[str]] = None,
+    parser_class: type[ArgumentParser] = ArgumentParser,
+) -> Namespace:
+    """Parses the command line arguments."""
+
+    return get_parser(parser_class).parse_args(argv)
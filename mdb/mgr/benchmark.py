@@ -0,0 +1,49 @@
+"""Benchmarks of cascading strategies."""
+
+from time import perf_counter
+from typing import Callable, Iterator
+
+from mdb.orm import Company
+from mdb.orm import Customer
+from mdb.orm import Employee
+from mdb.orm import Tenement
+from mdb.prefetch import prefetch
+
+
+__all__ = ["MODELS", "benchmark_cascade"]
+
+
+MODELS = {
+    "company": Company,
+    "customer": Customer,
+    "employee": Employee,
+    "tenement": Tenement,
+}
+STRATEGIES = {
+    "join": lambda model: list(model.select(cascade=True)),
+    "prefetch": lambda model: prefetch(model.select()),
+}
+
+
+def _measure(function: Callable[[], list], repetitions: int) -> tuple[float, int]:
+    """Returns the average runtime and the amount of records."""
+
+    start = perf_counter()
+
+    for _ in range(repetitions):
+        records = function()
+
+    return (perf_counter() - start) / repetitions, len(records)
+
+
+def benchmark_cascade(
+    table: str, repetitions: int = 1
+) -> Iterator[tuple[str, float, int]]:
+    """Yields the strategy name, the average runtime
+    and the amount of records for each cascading strategy.
+    """
+
+    model = MODELS[table]
+
+    for name, strategy in STRATEGIES.items():
+        yield name, *_measure(lambda: strategy(model), repetitions)
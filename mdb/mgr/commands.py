@@ -0,0 +1,107 @@
+"""Commands of the database management utility."""
+
+from sys import stderr, stdout
+
+from peewee import ModelSelect
+from playhouse.db_url import connect
+
+from mdb.cache import FileBackend, configure
+from mdb.dedupe import merge_addresses
+from mdb.export import MODELS as EXPORTABLE, export
+from mdb.mgr.argparse import get_args
+from mdb.mgr.benchmark import benchmark_cascade
+from mdb.mgr.functions import find_lines, find_recods
+from mdb.mgr.profile import explain, profile
+from mdb.mgr.server import serve_socket, serve_stdin
+from mdb.schema import apply, check, full_scans
+from mdb.snapshot import build
+from mdb.summary import rebuild
+from mdb.sync import MODELS, sync
+
+__all__ = ["run"]
+
+
+def run() -> None:
+    """Runs the command given on the command line."""
+
+    args = get_args()
+
+    if args.action == "find" and (args.explain or args.profile):
+        if isinstance(select := find_recods(args), ModelSelect):
+            if args.explain:
+                print(*explain(select), sep="\n")
+
+            if args.profile:
+                print(
+                    *profile(select, output_format=args.format).lines,
+                    sep="\n",
+                    file=stderr,
+                )
+    elif args.action == "find":
+        for line in find_lines(args):
+            print(line)
+
+    if args.action == "serve" and args.socket is not None:
+        serve_socket(args.socket, args.workers)
+    elif args.action == "serve":
+        serve_stdin(args.workers)
+
+    if args.action == "benchmark" and args.benchmark == "cascade":
+        for strategy, seconds, records in benchmark_cascade(
+            args.table, args.repetitions
+        ):
+            print(strategy, f"{seconds:.6f}", records, sep="\t")
+
+    if args.action == "export":
+        model = next(
+            model for model in EXPORTABLE if model._meta.table_name == args.table
+        )
+
+        if args.file is None:
+            export(model.select(cascade=True), stdout.buffer)
+        else:
+            with args.file.open("wb") as file:
+                export(model.select(cascade=True), file)
+
+    if args.action == "snapshot":
+        build(args.file)
+
+    if args.action == "summary" and args.summary == "rebuild":
+        rebuild()
+
+    if args.action == "sync":
+        for diff in sync(
+            connect(args.target),
+            [
+                model
+                for model in MODELS
+                if args.tables is None or model._meta.table_name in args.tables
+            ],
+            leaf_size=args.leaf_size,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+        ):
+            print(
+                diff.model.__name__,
+                diff.ranges,
+                len(diff.upserts),
+                len(diff.deletes),
+                sep="\t",
+            )
+
+    if args.action == "schema" and args.schema == "check":
+        for result in (*check(), *full_scans()):
+            print(result)
+
+    if args.action == "schema" and args.schema == "apply":
+        for index in apply():
+            print("Created:", index)
+
+    if args.action == "dedupe" and args.dedupe == "addresses":
+        if args.cache_dir is not None:
+            configure(FileBackend(args.cache_dir))
+
+        report = merge_addresses(
+            batch_size=args.batch_size, pause=args.pause, dry_run=args.dry_run
+        )
+        print(*report.lines, sep="\n")
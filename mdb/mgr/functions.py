@@ -1,8 +1,9 @@
 """Common functions."""
 
 from argparse import Namespace
+from typing import Callable, Iterator
 
-from peewee import ModelSelect
+from peewee import Model, ModelSelect
 
 from mdb.orm import Address
 from mdb.orm import Company
@@ -10,9 +11,11 @@ from mdb.orm import Customer
 from mdb.orm import Department
 from mdb.orm import Employee
 from mdb.orm import Tenement
+from mdb.rows import Row, rows
+from mdb.serialization import encode, serializer
 
 
-__all__ = ["find_recods"]
+__all__ = ["find_lines", "find_recods", "find_rows", "formatter"]
 
 
 def find_addresses(args: Namespace) -> ModelSelect:
@@ -166,3 +169,32 @@ def find_recods(args: Namespace) -> ModelSelect:  # pylint: disable=R0911
         return find_tenements(args)
 
     return []
+
+
+def find_rows(args: Namespace) -> Iterator[Row]:
+    """Finds records as lightweight read-only rows."""
+
+    if isinstance(select := find_recods(args), ModelSelect):
+        yield from rows(select)
+
+
+def formatter(model: type[Model], output_format: str) -> Callable[[Row], str]:
+    """Returns a function to format rows of the model as lines."""
+
+    if output_format == "jsonl":
+        serialize = serializer(model, null=True)
+        return lambda row: encode(serialize(row)).decode()
+
+    return lambda row: "\t".join(map(str, row.to_csv()))
+
+
+def find_lines(args: Namespace) -> Iterator[str]:
+    """Finds records and yields them as lines in the requested format."""
+
+    if not isinstance(select := find_recods(args), ModelSelect):
+        return
+
+    line = formatter(select.model, args.format)
+
+    for row in rows(select):
+        yield line(row)
@@ -0,0 +1,109 @@
+"""Query plans and profiling of find queries."""
+
+from os import devnull
+from sys import stdout
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import Iterator, NamedTuple, TextIO
+
+from peewee import ModelSelect
+
+from mdb.mgr.functions import formatter
+from mdb.rows import from_tuples
+
+
+__all__ = ["Profile", "explain", "profile"]
+
+
+class Profile(NamedTuple):
+    """Profiling results of a query."""
+
+    execution: float
+    fetch: float
+    construction: float
+    formatting: float
+    peak_memory: int
+    rows: int
+
+    @property
+    def total(self) -> float:
+        """Returns the total wall time."""
+        return self.execution + self.fetch + self.construction + self.formatting
+
+    @property
+    def lines(self) -> Iterator[str]:
+        """Yields lines for a human-readable report."""
+        yield f"Query execution:    {self.execution:.6f} s"
+        yield f"Fetch:              {self.fetch:.6f} s"
+        yield f"Model construction: {self.construction:.6f} s"
+        yield f"Output formatting:  {self.formatting:.6f} s"
+        yield f"Total:              {self.total:.6f} s"
+        yield f"Peak memory:        {self.peak_memory / 1024:.1f} KiB"
+        yield f"Rows:               {self.rows}"
+
+        if self.total:
+            yield f"Rows per second:    {self.rows / self.total:.1f}"
+
+
+def explain(select: ModelSelect) -> Iterator[str]:
+    """Yields the SQL and the query plan of the select."""
+
+    sql, params = select.sql()
+    yield sql
+    yield f"Parameters: {params}"
+    cursor = select.model._meta.database.execute_sql(f"EXPLAIN {sql}", params)
+    yield "\t".join(column for column, *_ in cursor.description)
+
+    for row in cursor:
+        yield "\t".join(map(str, row))
+
+
+def _run(
+    select: ModelSelect, file: TextIO, output_format: str
+) -> tuple[list[float], int]:
+    """Executes the select and writes its rows to the file in the given format.
+
+    Returns the timestamps between the phases and the amount of rows.
+    """
+
+    sql, params = select.sql()
+    line = formatter(select.model, output_format)
+    timestamps = [perf_counter()]
+    cursor = select.model._meta.database.execute_sql(sql, params)
+    timestamps.append(perf_counter())
+    records = cursor.fetchall()
+    timestamps.append(perf_counter())
+    rows = list(from_tuples(select.model, records))
+    timestamps.append(perf_counter())
+    file.writelines(line(row) + "\n" for row in rows)
+    timestamps.append(perf_counter())
+    return timestamps, len(rows)
+
+
+def profile(
+    select: ModelSelect, file: TextIO = stdout, output_format: str = "tsv"
+) -> Profile:
+    """Executes the select, writes its rows to
+    the file in the given format and profiles it.
+
+    Since tracing memory allocations slows down the execution,
+    the peak memory is measured in a second, untimed pass,
+    which discards the formatted rows.
+    """
+
+    timestamps, rows = _run(select, file, output_format)
+    start()
+
+    try:
+        with open(devnull, "w", encoding="utf-8") as null:
+            _run(select, null, output_format)
+
+        _, peak = get_traced_memory()
+    finally:
+        stop()
+
+    return Profile(
+        *(end - begin for begin, end in zip(timestamps, timestamps[1:])),
+        peak,
+        rows,
+    )
@@ -0,0 +1,167 @@
+"""Long-running find server.
+
+Each request is a line of mdbmgr find arguments, e.g.
+"find customer -n HOMEINFO --format jsonl". The server responds with
+the result lines followed by an empty line. Errors are reported as a
+single line starting with "ERROR<TAB>", followed by an empty line.
+The requests are processed by a fixed pool of worker threads, each of
+which keeps its database connection open across requests. Connections
+which have been closed by the database server, e.g. after its
+wait_timeout, are reopened and the request is retried once.
+Usage and help messages of the argument parser are not written to the
+server's stdout or stderr, but reported as errors.
+"""
+
+from __future__ import annotations
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from queue import Queue
+from shlex import split
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+from sys import stdin, stdout
+from threading import Thread
+from typing import NoReturn, Optional, TextIO
+
+from peewee import OperationalError
+
+from mdbclient import ERROR
+
+from mdb.mgr.argparse import get_args
+from mdb.orm import DATABASE
+from mdb.mgr.functions import find_lines
+
+
+__all__ = ["serve_socket", "serve_stdin"]
+
+
+# MySQL client errors of connections which have
+# been closed by the server or have been lost.
+RECONNECT_ERRORS = {2006, 2013, 2014, 4031}
+
+
+class RequestParser(ArgumentParser):
+    """Argument parser raising ValueErrors instead of
+    printing messages and exiting.
+    """
+
+    def _print_message(self, message: str, file: Optional[TextIO] = None) -> None:
+        """Does not print any messages."""
+
+    def exit(self, status: int = 0, message: Optional[str] = None) -> NoReturn:
+        raise ValueError(message or "Help is not available.")
+
+    def error(self, message: str) -> NoReturn:
+        raise ValueError(f"Invalid arguments: {message}")
+
+
+def _find_lines(args: Namespace) -> list[str]:
+    """Returns the result lines of the find request.
+
+    If the connection has been closed by the database
+    server, it is reopened and the request is retried once.
+    """
+
+    try:
+        return list(find_lines(args))
+    except OperationalError as error:
+        if not error.args or error.args[0] not in RECONNECT_ERRORS:
+            raise
+
+    DATABASE.close()
+    return list(find_lines(args))
+
+
+def respond(line: str) -> list[str]:
+    """Processes a request line and returns the response lines."""
+
+    try:
+        args = get_args(split(line), RequestParser)
+    except ValueError as error:
+        return [f"{ERROR}{error}", ""]
+
+    if args.action != "find" or args.explain or args.profile:
+        return [f"{ERROR}Only find requests are supported.", ""]
+
+    try:
+        return [*_find_lines(args), ""]
+    except Exception as error:  # pylint: disable=W0703
+        return [f"{ERROR}{error}", ""]
+
+
+class RequestHandler(StreamRequestHandler):
+    """Handles the requests of a client connection
+    using the server's pool of workers.
+    """
+
+    server: Server
+
+    def handle(self):
+        for line in self.rfile:
+            if not (line := line.decode().strip()):
+                continue
+
+            response = self.server.executor.submit(respond, line).result()
+
+            try:
+                for response_line in response:
+                    self.wfile.write(f"{response_line}\n".encode())
+
+                self.wfile.flush()
+            except BrokenPipeError:
+                return  # The client disconnected.
+
+
+class Server(ThreadingUnixStreamServer):
+    """Unix socket server dispatching the requests to a pool of workers."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, executor: Executor):
+        super().__init__(str(path), RequestHandler)
+        self.executor = executor
+
+
+def serve_socket(path: Path, workers: int) -> None:
+    """Serves requests on the Unix socket."""
+
+    path.unlink(missing_ok=True)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        with Server(path, executor) as server:
+            server.serve_forever()
+
+
+def _write_responses(futures: Queue, responses: TextIO) -> None:
+    """Writes the responses of the futures in order
+    until None is received.
+    """
+
+    while (future := futures.get()) is not None:
+        responses.writelines(f"{line}\n" for line in future.result())
+        responses.flush()
+
+
+def serve_stdin(
+    workers: int, requests: TextIO = stdin, responses: TextIO = stdout
+) -> None:
+    """Serves requests from stdin concurrently and
+    writes the responses to stdout in order of the requests.
+
+    Each request is processed as soon as it has been read, and
+    each response is written as soon as it and all of its
+    predecessors are complete.
+    """
+
+    futures = Queue(maxsize=2 * workers)
+    writer = Thread(target=_write_responses, args=(futures, responses))
+    writer.start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for line in iter(requests.readline, ""):
+                if line := line.strip():
+                    futures.put(executor.submit(respond, line))
+    finally:
+        futures.put(None)
+        writer.join()
@@ -1,23 +1,30 @@
 """HOMEINFO's main data database."""
 
 from __future__ import annotations
-from typing import Iterator, Optional, Union
+from typing import Callable, Iterator, Optional, Sequence, Union
 
 from peewee import JOIN
 from peewee import CharField
+from peewee import Field
 from peewee import ForeignKeyField
 from peewee import IntegerField
+from peewee import Model
 from peewee import Select
 
 from peeweeplus import JSONModel, MySQLDatabaseProxy
 
 from mdb.enumerations import State
 from mdb.exceptions import AlreadyExists
+from mdb.patterns import Kind, classify
 from mdb.zip_codes import get_state
 
 
 __all__ = [
     "DATABASE",
+    "POST_DELETE",
+    "POST_SAVE",
+    "PRE_DELETE",
+    "PRE_SAVE",
     "Address",
     "Company",
     "Department",
@@ -29,6 +36,27 @@ __all__ = [
 
 DATABASE = MySQLDatabaseProxy("mdb")
 GERMANY = {"Deutschland", "Germany", "DE"}
+POST_DELETE: list[Callable[[MDBModel], None]] = []
+POST_SAVE: list[Callable[[MDBModel, frozenset[str]], None]] = []
+PRE_DELETE: list[Callable[[MDBModel], None]] = []
+PRE_SAVE: list[Callable[[MDBModel, frozenset[str]], None]] = []
+Join = tuple[type[Model], type[Model], str]
+
+
+def _project(select: Select, only: Sequence[Field], *joins: Join) -> Select:
+    """Adds the joins needed by the projected fields to the select.
+
+    Inner joins are always added, since they may filter records,
+    outer joins only if a projected field belongs to the joined model.
+    """
+
+    models = {field.model for field in only}
+
+    for source, target, join_type in joins:
+        if join_type == JOIN.INNER or target in models:
+            select = select.join_from(source, target, join_type=join_type)
+
+    return select
 
 
 class MDBModel(JSONModel):
@@ -42,13 +70,60 @@ class MDBModel(JSONModel):
         """Returns the model's ID as per default."""
         return str(self.id)
 
+    def save(self, *args, **kwargs) -> int:
+        """Saves the record and runs the pre-save and post-save
+        hooks with the names of the changed fields.
+        """
+        fields = frozenset(field.name for field in self.dirty_fields)
+
+        for hook in PRE_SAVE:
+            hook(self, fields)
+
+        result = super().save(*args, **kwargs)
+
+        for hook in POST_SAVE:
+            hook(self, fields)
+
+        return result
+
+    def delete_instance(self, *args, **kwargs) -> int:
+        """Deletes the record and runs the pre-delete and post-delete hooks."""
+        for hook in PRE_DELETE:
+            hook(self)
+
+        result = super().delete_instance(*args, **kwargs)
+
+        for hook in POST_DELETE:
+            hook(self)
+
+        return result
+
+    @classmethod
+    def select(
+        cls,
+        *args,
+        cascade: bool = False,
+        only: Optional[Sequence[Field]] = None,
+    ) -> Select:
+        """Selects records.
+
+        Models with related models override this
+        to join them if cascade is True.
+        If only is given, only the respective fields are selected
+        and only the related models they need are joined.
+        """
+        return super().select(*(only or ()), *args)
+
 
 class Address(MDBModel):
     """Address data."""
 
+    class Meta:
+        indexes = ((("street", "house_number", "zip_code", "city"), False),)
+
     street = CharField(64)
-    house_number = CharField(8)
-    zip_code = CharField(32)
+    house_number = CharField(8, index=True)
+    zip_code = CharField(32, index=True)
     city = CharField(64)
     district = CharField(64, null=True)
 
@@ -89,9 +164,38 @@ class Address(MDBModel):
             )
 
     @classmethod
-    def find(cls, pattern: str) -> Select:
-        """Finds an address."""
-        return cls.select().where(
+    def find(cls, pattern: str, *, only: Optional[Sequence[Field]] = None) -> Select:
+        """Finds an address.
+
+        ZIP codes, ZIP codes with a city and streets with a house number
+        are looked up using index-friendly predicates. Short numbers are
+        looked up as prefixes of ZIP codes or house numbers.
+        Other patterns are searched for in all fields.
+        """
+        kind, groups = classify(pattern)
+
+        if kind == Kind.ZIP_CODE:
+            return cls.select(only=only).where(cls.zip_code == groups[0])
+
+        if kind == Kind.ZIP_PREFIX:
+            return cls.select(only=only).where(
+                cls.zip_code.startswith(groups[0])
+                | cls.house_number.startswith(groups[0])
+            )
+
+        if kind == Kind.ZIP_CODE_CITY:
+            zip_code, city = groups
+            return cls.select(only=only).where(
+                (cls.zip_code == zip_code) & cls.city.startswith(city)
+            )
+
+        if kind == Kind.STREET_HOUSE_NUMBER:
+            street, house_number = groups
+            return cls.select(only=only).where(
+                cls.street.startswith(street) & (cls.house_number == house_number)
+            )
+
+        return cls.select(only=only).where(
             (cls.street ** (pattern := f"%{pattern}%"))
             | (cls.house_number**pattern)
             | (cls.zip_code**pattern)
@@ -103,6 +207,14 @@ class Address(MDBModel):
         """Returns the respective state."""
         return get_state(self.zip_code)
 
+    @property
+    def state_name(self) -> Optional[str]:
+        """Returns the name of the respective state, if it can be determined."""
+        try:
+            return self.state.value
+        except (KeyError, ValueError):
+            return None
+
     @property
     def street_houseno(self) -> str:
         """Returns street and house number."""
@@ -152,7 +264,7 @@ class Address(MDBModel):
 class Company(MDBModel):
     """Represents companies HOMEINFO has relations to."""
 
-    name = CharField(255)
+    name = CharField(255, index=True)
     address = ForeignKeyField(
         Address, column_name="address", null=True, lazy_load=False
     )
@@ -178,17 +290,29 @@ class Company(MDBModel):
         raise AlreadyExists(company, name=name)
 
     @classmethod
-    def find(cls, pattern: str) -> Select:
+    def find(cls, pattern: str, *, only: Optional[Sequence[Field]] = None) -> Select:
         """Finds companies by primary key or name."""
         condition = cls.name ** f"%{pattern}%"
         condition |= cls.annotation ** f"%{pattern}%"
-        return cls.select(cascade=True).where(condition)
+        return cls.select(cascade=True, only=only).where(condition)
 
     @classmethod
-    def select(cls, *args, cascade: bool = False) -> Select:
+    def select(
+        cls,
+        *args,
+        cascade: bool = False,
+        only: Optional[Sequence[Field]] = None,
+    ) -> Select:
         """Selects companies."""
         if not cascade:
-            return super().select(*args)
+            return super().select(*args, only=only)
+
+        if only is not None:
+            return _project(
+                super().select(*args, only=only),
+                only,
+                (cls, Address, JOIN.LEFT_OUTER),
+            )
 
         return (
             super().select(cls, Address, *args).join(Address, join_type=JOIN.LEFT_OUTER)
@@ -220,11 +344,11 @@ class Department(MDBModel):
         return self.name
 
     @classmethod
-    def find(cls, pattern: str) -> Select:
+    def find(cls, pattern: str, *, only: Optional[Sequence[Field]] = None) -> Select:
         """Finds a department."""
         condition = cls.name ** f"%{pattern}%"
         condition |= cls.type * f"%{pattern}%"
-        return cls.select().where(condition)
+        return cls.select(only=only).where(condition)
 
     def to_csv(self) -> tuple[int, str, str]:
         """Returns a tuple of corresponding values."""
@@ -241,10 +365,10 @@ class Employee(MDBModel):
         Department, column_name="department", backref="staff", lazy_load=False
     )
     first_name = CharField(32, null=True)
-    surname = CharField(32)
+    surname = CharField(32, index=True)
     phone = CharField(32, null=True)
     cellphone = CharField(32, null=True)
-    email = CharField(64, null=True)
+    email = CharField(64, null=True, index=True)
     phone_alt = CharField(32, null=True)
     fax = CharField(32, null=True)
     address = ForeignKeyField(
@@ -259,17 +383,42 @@ class Employee(MDBModel):
         return self.surname
 
     @classmethod
-    def find(cls, pattern: str) -> Select:
-        """Finds an employee."""
+    def find(cls, pattern: str, *, only: Optional[Sequence[Field]] = None) -> Select:
+        """Finds an employee by name or email address.
+
+        When projecting, fields of Address refer to the company's address.
+        """
+        kind, groups = classify(pattern)
+
+        if kind == Kind.EMAIL:
+            return cls.select(cascade=True, only=only).where(cls.email == groups[0])
+
         condition = cls.surname ** f"%{pattern}%"
         condition |= cls.first_name ** f"%{pattern}%"
-        return cls.select(cascade=True).where(condition)
+        return cls.select(cascade=True, only=only).where(condition)
 
     @classmethod
-    def select(cls, *args, cascade: bool = False) -> Select:
-        """Selects employees."""
+    def select(
+        cls,
+        *args,
+        cascade: bool = False,
+        only: Optional[Sequence[Field]] = None,
+    ) -> Select:
+        """Selects employees.
+
+        When projecting, fields of Address refer to the company's address.
+        """
         if not cascade:
-            return super().select(*args)
+            return super().select(*args, only=only)
+
+        if only is not None:
+            return _project(
+                super().select(*args, only=only),
+                only,
+                (cls, Company, JOIN.INNER),
+                (Company, Address, JOIN.LEFT_OUTER),
+                (cls, Department, JOIN.INNER),
+            )
 
         personal_address = Address.alias()
         return (
@@ -313,7 +462,7 @@ class Customer(MDBModel):
     reseller = ForeignKeyField(
         "self", column_name="reseller", lazy_load=False, null=True, backref="resellees"
     )
-    abbreviation = CharField(32)
+    abbreviation = CharField(32, index=True)
     annotation = CharField(255, null=True)
 
     def __str__(self):
@@ -325,23 +474,41 @@ class Customer(MDBModel):
         return str(self.id)
 
     @classmethod
-    def find(cls, pattern: str) -> Select:
-        """Finds a customer by the provided pattern."""
-        try:
-            cid = int(pattern)
-        except ValueError:
+    def find(cls, pattern: str, *, only: Optional[Sequence[Field]] = None) -> Select:
+        """Finds a customer by the provided pattern.
+
+        Numbers are looked up as customer IDs. Other patterns
+        are looked up as abbreviations or searched for in the
+        company name.
+        """
+        kind, groups = classify(pattern)
+
+        if kind in {Kind.ZIP_CODE, Kind.ZIP_PREFIX, Kind.NUMBER}:
+            condition = Customer.id == int(groups[0])
+        else:
             condition = cls.abbreviation**pattern
             condition |= Company.name ** f"%{pattern}%"
-        else:
-            condition = Customer.id == cid
 
-        return cls.select(cascade=True).where(condition)
+        return cls.select(cascade=True, only=only).where(condition)
 
     @classmethod
-    def select(cls, *args, cascade: bool = False) -> Select:
+    def select(
+        cls,
+        *args,
+        cascade: bool = False,
+        only: Optional[Sequence[Field]] = None,
+    ) -> Select:
         """Selects customers."""
         if not cascade:
-            return super().select(*args)
+            return super().select(*args, only=only)
+
+        if only is not None:
+            return _project(
+                super().select(*args, only=only),
+                only,
+                (cls, Company, JOIN.INNER),
+                (Company, Address, JOIN.LEFT_OUTER),
+            )
 
         return (
             super()
@@ -402,10 +569,27 @@ class Tenement(MDBModel):
         return tenement
 
     @classmethod
-    def select(cls, *args, cascade: bool = False) -> Select:
-        """Selects tenements."""
+    def select(
+        cls,
+        *args,
+        cascade: bool = False,
+        only: Optional[Sequence[Field]] = None,
+    ) -> Select:
+        """Selects tenements.
+
+        When projecting, fields of Address refer to the tenement's address.
+        """
         if not cascade:
-            return super().select(*args)
+            return super().select(*args, only=only)
+
+        if only is not None:
+            return _project(
+                super().select(*args, only=only),
+                only,
+                (cls, Customer, JOIN.INNER),
+                (Customer, Company, JOIN.INNER),
+                (cls, Address, JOIN.INNER),
+            )
 
         customer_address = Address.alias()
         return (
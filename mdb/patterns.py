@@ -0,0 +1,52 @@
+"""Classification of search patterns."""
+
+from __future__ import annotations
+from enum import Enum
+from re import compile  # pylint: disable=W0622
+from typing import NamedTuple
+
+
+__all__ = ["Kind", "Pattern", "classify"]
+
+
+class Kind(Enum):
+    """Kinds of search patterns."""
+
+    ZIP_CODE = "ZIP code"
+    ZIP_PREFIX = "ZIP code prefix"
+    NUMBER = "number"
+    ZIP_CODE_CITY = "ZIP code and city"
+    STREET_HOUSE_NUMBER = "street and house number"
+    EMAIL = "email address"
+    TEXT = "text"
+
+
+class Pattern(NamedTuple):
+    """A classified search pattern."""
+
+    kind: Kind
+    groups: tuple[str, ...]
+
+
+EXPRESSIONS = [
+    (Kind.ZIP_CODE, compile(r"(\d{5})")),
+    (Kind.ZIP_PREFIX, compile(r"(\d{1,4})")),
+    (Kind.NUMBER, compile(r"(\d+)")),
+    (Kind.ZIP_CODE_CITY, compile(r"(\d{5})[ \t]+(\D.*)")),
+    (Kind.STREET_HOUSE_NUMBER, compile(r"(\D.*?)[ \t]+(\d+[ \t]?[a-zA-Z]?)")),
+    (Kind.EMAIL, compile(r"([^@ \t]+@[^@ \t]+\.[^@ \t]+)")),
+]
+
+
+def classify(pattern: str) -> Pattern:
+    """Classifies the search pattern.
+
+    The groups of all kinds but text are taken from the stripped pattern.
+    Text patterns are kept as they are.
+    """
+
+    for kind, expression in EXPRESSIONS:
+        if match := expression.fullmatch(pattern.strip()):
+            return Pattern(kind, match.groups())
+
+    return Pattern(Kind.TEXT, (pattern,))
@@ -0,0 +1,90 @@
+"""Prefetch-based cascading of MDB records.
+
+As an alternative to the wide multi-joins of select(cascade=True),
+the base records are loaded first and the distinct related records
+are fetched afterwards by batched IN queries. Each related record is
+instantiated only once and shared among all records referencing it.
+"""
+
+from __future__ import annotations
+from typing import Iterable
+
+from peewee import Model, ModelSelect
+
+from mdb.orm import Address
+from mdb.orm import Company
+from mdb.orm import Customer
+from mdb.orm import Department
+from mdb.orm import Employee
+from mdb.orm import Tenement
+
+
+__all__ = ["RELATIONS", "prefetch"]
+
+
+BATCH_SIZE = 1000
+RELATIONS = {
+    Address: {},
+    Company: {"address": {}},
+    Customer: {"company": {"address": {}}},
+    Department: {},
+    Employee: {"company": {"address": {}}, "department": {}, "address": {}},
+    Tenement: {"customer": {"company": {"address": {}}}, "address": {}},
+}
+
+
+def _fetch(
+    model: type[Model], ids: Iterable[int], cache: dict[int, Model], batch_size: int
+) -> None:
+    """Fetches the records with the given IDs which are not yet cached."""
+
+    missing = [ident for ident in ids if ident not in cache]
+
+    for offset in range(0, len(missing), batch_size):
+        batch = missing[offset : offset + batch_size]
+
+        for record in model.select().where(model.id << batch):
+            cache[record.id] = record
+
+
+def _cascade(
+    records: list[Model],
+    model: type[Model],
+    relations: dict,
+    caches: dict[type[Model], dict[int, Model]],
+    batch_size: int,
+) -> None:
+    """Assigns the related records to the given records."""
+
+    for name, subrelations in relations.items():
+        field = model._meta.fields[name]
+        cache = caches.setdefault(field.rel_model, {})
+        ids = {getattr(record, field.object_id_name) for record in records}
+        ids.discard(None)
+        _fetch(field.rel_model, ids, cache, batch_size)
+
+        for record in records:
+            if (ident := getattr(record, field.object_id_name)) in cache:
+                record.__rel__[name] = cache[ident]
+
+        related = [cache[ident] for ident in ids if ident in cache]
+        _cascade(related, field.rel_model, subrelations, caches, batch_size)
+
+
+def prefetch(
+    select: ModelSelect, *, relations: dict = None, batch_size: int = BATCH_SIZE
+) -> list[Model]:
+    """Returns the selected records with their related records prefetched.
+
+    The select should be a plain select of the respective model,
+    e.g. prefetch(Tenement.select().where(Tenement.customer == 1030))
+    instead of Tenement.select(cascade=True).where(Tenement.customer == 1030).
+    The relations to prefetch default to those of the model's cascade.
+    """
+
+    if relations is None:
+        relations = RELATIONS[select.model]
+
+    records = list(select)
+    _cascade(records, select.model, relations, {}, batch_size)
+    return records
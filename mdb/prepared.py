@@ -0,0 +1,81 @@
+"""Precompiled find() and cascaded select queries.
+
+The SQL of each query shape is compiled once per process and then
+executed with the bound parameters of the respective search pattern.
+The shape of a find() query depends on the kind of the pattern, so it
+is compiled from a sentinel pattern of the same kind and executed with
+the pattern's classified group, just like find() uses it. Kinds which
+are split into several parameters are not precompiled.
+The results are yielded as lightweight read-only rows.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Iterator
+
+from peewee import Model
+
+from mdb.orm import DATABASE
+from mdb.patterns import Kind, classify
+from mdb.rows import Row, from_tuples, rows
+
+
+__all__ = ["find", "select"]
+
+
+SENTINELS = {
+    Kind.ZIP_CODE: "98765",
+    Kind.ZIP_PREFIX: "9876",
+    Kind.NUMBER: "987654321",
+    Kind.EMAIL: "sentinel@pattern.invalid",
+    Kind.TEXT: "\x1fpattern\x1f",
+}
+Parameter = Callable[[str], Any]
+Query = tuple[str, list[Parameter]]
+QUERIES: dict[tuple[type[Model], Kind], Query] = {}
+SELECTS: dict[type[Model], tuple[str, list]] = {}
+
+
+def _parameter(value: Any, sentinel: str) -> Parameter:
+    """Returns a function to bind the pattern to the respective parameter."""
+
+    if isinstance(value, str) and sentinel in value:
+        return lambda pattern: value.replace(sentinel, pattern)
+
+    if sentinel.isdigit() and value == int(sentinel):
+        return int
+
+    return lambda _: value
+
+
+def _compile(model: type[Model], sentinel: str) -> Query:
+    """Compiles the find query of the model for the given sentinel."""
+
+    sql, values = model.find(sentinel).sql()
+    return sql, [_parameter(value, sentinel) for value in values]
+
+
+def find(model: type[Model], pattern: str) -> Iterator[Row]:
+    """Yields rows of the model's find() query for the given pattern."""
+
+    kind, groups = classify(pattern)
+
+    if (sentinel := SENTINELS.get(kind)) is None:
+        return rows(model.find(pattern))
+
+    if (query := QUERIES.get(key := (model, kind))) is None:
+        query = QUERIES[key] = _compile(model, sentinel)
+
+    (value,) = groups
+    sql, parameters = query
+    cursor = DATABASE.execute_sql(sql, [parameter(value) for parameter in parameters])
+    return from_tuples(model, cursor)
+
+
+def select(model: type[Model]) -> Iterator[Row]:
+    """Yields rows of the model's cascaded select."""
+
+    if (query := SELECTS.get(model)) is None:
+        query = SELECTS[model] = model.select(cascade=True).sql()
+
+    sql, values = query
+    return from_tuples(model, DATABASE.execute_sql(sql, values))
@@ -0,0 +1,260 @@
+"""Lightweight read-only rows of MDB models."""
+
+from __future__ import annotations
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+from peewee import Model, ModelSelect
+
+from mdb.orm import Address
+from mdb.orm import Company
+from mdb.orm import Customer
+from mdb.orm import Department
+from mdb.orm import Employee
+from mdb.orm import Tenement
+
+
+__all__ = [
+    "AddressRow",
+    "CompanyRow",
+    "CustomerRow",
+    "DepartmentRow",
+    "EmployeeRow",
+    "TenementRow",
+    "Row",
+    "from_tuples",
+    "rows",
+]
+
+
+class AddressRow(NamedTuple):
+    """Read-only address row."""
+
+    id: int
+    street: str
+    house_number: str
+    zip_code: str
+    city: str
+    district: Optional[str]
+
+    __str__ = Address.__str__
+    state = Address.state
+    state_name = Address.state_name
+    street_houseno = Address.street_houseno
+    city_district = Address.city_district
+    zip_code_city = Address.zip_code_city
+    oneliner = Address.oneliner
+    lines = Address.lines
+    text = Address.text
+    to_csv = Address.to_csv
+
+
+class CompanyRow(NamedTuple):
+    """Read-only company row."""
+
+    id: int
+    name: str
+    address_id: Optional[int]
+    annotation: Optional[str]
+    address: Optional[AddressRow] = None
+
+    __str__ = Company.__str__
+    to_csv = Company.to_csv
+
+
+class DepartmentRow(NamedTuple):
+    """Read-only department row."""
+
+    id: int
+    name: str
+    type: Optional[str]
+
+    __str__ = Department.__str__
+    to_csv = Department.to_csv
+
+
+class EmployeeRow(NamedTuple):
+    """Read-only employee row."""
+
+    id: int
+    company_id: int
+    department_id: int
+    first_name: Optional[str]
+    surname: str
+    phone: Optional[str]
+    cellphone: Optional[str]
+    email: Optional[str]
+    phone_alt: Optional[str]
+    fax: Optional[str]
+    address_id: Optional[int]
+    company: Optional[CompanyRow] = None
+    department: Optional[DepartmentRow] = None
+    address: Optional[AddressRow] = None
+
+    __str__ = Employee.__str__
+    to_csv = Employee.to_csv
+
+
+class CustomerRow(NamedTuple):
+    """Read-only customer row."""
+
+    id: int
+    company_id: int
+    reseller_id: Optional[int]
+    abbreviation: str
+    annotation: Optional[str]
+    company: Optional[CompanyRow] = None
+
+    __str__ = Customer.__str__
+    name = Customer.name
+    to_csv = Customer.to_csv
+
+
+class TenementRow(NamedTuple):
+    """Read-only tenement row."""
+
+    id: int
+    customer_id: int
+    address_id: int
+    rental_unit: Optional[str]
+    living_unit: Optional[str]
+    annotation: Optional[str]
+    customer: Optional[CustomerRow] = None
+    address: Optional[AddressRow] = None
+
+    to_csv = Tenement.to_csv
+
+
+Row = Union[
+    AddressRow, CompanyRow, CustomerRow, DepartmentRow, EmployeeRow, TenementRow
+]
+
+
+def _split(record: tuple, *models: type[Model]) -> Iterator[Optional[tuple]]:
+    """Splits a flat record into the columns of the respective models.
+
+    Models whose columns are not contained in the record or which
+    were not matched by an outer join are yielded as None.
+    """
+
+    offset = 0
+
+    for model in models:
+        size = len(model._meta.sorted_fields)
+        values = record[offset : offset + size]
+        offset += size
+
+        if len(values) < size or values[0] is None:
+            yield None
+        else:
+            yield values
+
+
+def _make(row_type: type[Row], values: Optional[tuple], **related) -> Optional[Row]:
+    """Creates a row of the given type from the respective values."""
+
+    if values is None:
+        return None
+
+    return row_type(*values, **related)
+
+
+def _address(record: tuple) -> AddressRow:
+    """Creates an address row from a flat record."""
+
+    (address,) = _split(record, Address)
+    return _make(AddressRow, address)
+
+
+def _company(record: tuple) -> CompanyRow:
+    """Creates a company row from a flat record."""
+
+    company, address = _split(record, Company, Address)
+    return _make(CompanyRow, company, address=_make(AddressRow, address))
+
+
+def _customer(record: tuple) -> CustomerRow:
+    """Creates a customer row from a flat record."""
+
+    customer, company, address = _split(record, Customer, Company, Address)
+    company = _make(CompanyRow, company, address=_make(AddressRow, address))
+    return _make(CustomerRow, customer, company=company)
+
+
+def _department(record: tuple) -> DepartmentRow:
+    """Creates a department row from a flat record."""
+
+    (department,) = _split(record, Department)
+    return _make(DepartmentRow, department)
+
+
+def _employee(record: tuple) -> EmployeeRow:
+    """Creates an employee row from a flat record."""
+
+    employee, company, company_address, department, address = _split(
+        record, Employee, Company, Address, Department, Address
+    )
+    company = _make(CompanyRow, company, address=_make(AddressRow, company_address))
+    return _make(
+        EmployeeRow,
+        employee,
+        company=company,
+        department=_make(DepartmentRow, department),
+        address=_make(AddressRow, address),
+    )
+
+
+def _tenement(record: tuple) -> TenementRow:
+    """Creates a tenement row from a flat record.
+
+    The cascaded tenement select joins the tenement's
+    address twice, so the first address is skipped.
+    """
+
+    tenement, customer, _, company, address = _split(
+        record, Tenement, Customer, Address, Company, Address
+    )
+    customer = _make(CustomerRow, customer, company=_make(CompanyRow, company))
+    return _make(
+        TenementRow, tenement, customer=customer, address=_make(AddressRow, address)
+    )
+
+
+BUILDERS = {
+    Address: _address,
+    Company: _company,
+    Customer: _customer,
+    Department: _department,
+    Employee: _employee,
+    Tenement: _tenement,
+}
+
+
+def from_tuples(model: type[Model], records: Iterable[tuple]) -> Iterator[Row]:
+    """Yields rows of the given model from flat tuples as
+    selected by the model's (cascaded) select.
+    """
+
+    return map(BUILDERS[model], records)
+
+
+def rows(select: ModelSelect) -> Iterator[Row]:
+    """Yields read-only rows instead of model instances.
+
+    The select must have been created by the respective model's
+    select() method, with or without cascading.
+    Additional selected columns are ignored.
+    Raises a ValueError if the select is projected onto some
+    of the model's fields, since rows require all of them.
+    """
+
+    fields = select.model._meta.sorted_fields
+    columns = select.selected_columns
+
+    if len(columns) < len(fields) or any(
+        column is not field for column, field in zip(columns, fields)
+    ):
+        raise ValueError(
+            f"Cannot create rows from a projected {select.model.__name__} select."
+        )
+
+    return from_tuples(select.model, select.tuples().iterator())
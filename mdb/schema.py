@@ -0,0 +1,163 @@
+"""Management of the indexes backing the ORM's lookups."""
+
+from __future__ import annotations
+from re import findall
+from typing import Iterable, Iterator, NamedTuple
+
+from peewee import Database, ModelIndex, Model
+
+from mdb.functions import is_mysql
+from mdb.orm import DATABASE
+from mdb.orm import Address
+from mdb.orm import Company
+from mdb.orm import Customer
+from mdb.orm import Department
+from mdb.orm import Employee
+from mdb.orm import Tenement
+
+
+__all__ = ["MODELS", "Index", "FullScan", "check", "apply", "full_scans"]
+
+
+MODELS = [Address, Company, Department, Employee, Customer, Tenement]
+SEARCHABLE = [Address, Company, Department, Employee, Customer]
+SAMPLE_PATTERNS = ["example", "12345", "12"]
+
+
+class Index(NamedTuple):
+    """An index declared on a model."""
+
+    model: type[Model]
+    name: str
+    columns: tuple[str, ...]
+    unique: bool
+    exists: bool
+
+    def __str__(self):
+        unique = "UNIQUE " if self.unique else ""
+        columns = ", ".join(self.columns)
+        state = "present" if self.exists else "missing"
+        table = self.model._meta.table_name
+        return f"{unique}{self.name} ON {table} ({columns}): {state}"
+
+
+class FullScan(NamedTuple):
+    """A table fully scanned by a model's find() query."""
+
+    model: type[Model]
+    pattern: str
+    table: str
+
+    def __str__(self):
+        return (
+            f"{self.model.__name__}.find({self.pattern!r})"
+            f" scans table {self.table} completely"
+        )
+
+
+def _columns(index: ModelIndex) -> tuple[str, ...]:
+    """Returns the column names of the model index."""
+
+    return tuple(field.column_name for field in index._expressions)
+
+
+def _existing(model: type[Model], database: Database) -> list[tuple[str, ...]]:
+    """Returns the column names of the existing indexes of the model's table."""
+
+    return [
+        tuple(index.columns)
+        for index in database.get_indexes(model._meta.table_name, model._meta.schema)
+    ]
+
+
+def _covered(columns: tuple[str, ...], existing: Iterable[tuple[str, ...]]) -> bool:
+    """Determines whether an existing index starts with the given columns."""
+
+    return any(index[: len(columns)] == columns for index in existing)
+
+
+def check(
+    models: Iterable[type[Model]] = MODELS, database: Database = DATABASE
+) -> Iterator[Index]:
+    """Yields the declared indexes and whether they exist."""
+
+    for model in models:
+        existing = _existing(model, database)
+
+        for index in model._meta.fields_to_index():
+            columns = _columns(index)
+            yield Index(
+                model,
+                index._name,
+                columns,
+                index._unique,
+                _covered(columns, existing),
+            )
+
+
+def _create(index: Index, database: Database) -> None:
+    """Creates the index.
+
+    On MySQL the index is created online, i.e. without
+    locking the table against concurrent writes.
+    """
+
+    if not is_mysql(database):
+        for model_index in index.model._meta.fields_to_index():
+            if model_index._name == index.name:
+                database.execute(model_index.safe(True))
+
+        return
+
+    table = f"`{index.model._meta.table_name}`"
+
+    if schema := index.model._meta.schema:
+        table = f"`{schema}`.{table}"
+
+    unique = "UNIQUE " if index.unique else ""
+    columns = ", ".join(f"`{column}`" for column in index.columns)
+    database.execute_sql(
+        f"ALTER TABLE {table} ADD {unique}INDEX `{index.name}` ({columns}),"
+        " ALGORITHM=INPLACE, LOCK=NONE"
+    )
+
+
+def apply(
+    models: Iterable[type[Model]] = MODELS, database: Database = DATABASE
+) -> Iterator[Index]:
+    """Creates the missing indexes and yields them."""
+
+    for index in check(models, database):
+        if not index.exists:
+            _create(index, database)
+            yield index._replace(exists=True)
+
+
+def full_scans(
+    models: Iterable[type[Model]] = SEARCHABLE,
+    patterns: Iterable[str] = SAMPLE_PATTERNS,
+    database: Database = DATABASE,
+) -> Iterator[FullScan]:
+    """Yields the tables which the models' find() queries scan completely.
+
+    This requires the query plans of MySQL.
+    """
+
+    if not is_mysql(database):
+        return
+
+    for model in models:
+        for pattern in patterns:
+            sql, params = model.find(pattern).sql()
+            tables = dict(
+                (alias, table) for table, alias in findall(r"`(\w+)` AS `(\w+)`", sql)
+            )
+            cursor = database.execute_sql(f"EXPLAIN {sql}", params)
+            columns = [column for column, *_ in cursor.description]
+
+            for row in cursor:
+                plan = dict(zip(columns, row))
+
+                if plan.get("type") == "ALL":
+                    table = plan.get("table")
+                    yield FullScan(model, pattern, tables.get(table, table))
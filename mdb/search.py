@@ -0,0 +1,179 @@
+"""Concurrent search across the models' find() queries.
+
+Each search runs its queries concurrently on a thread pool of its own.
+The pools are reused by later searches once all of their queries have
+completed, so that their worker threads keep their database connections
+open. At most MAX_POOLS pools exist, which bounds the amount of threads
+and database connections. Searches exceeding it wait for a pool within
+their timeout and report all models as incomplete if none is released.
+Queries which fail or do not complete within the timeout are omitted from
+the results and reported as incomplete. Slow queries are not cancelled on
+the database server, but their results are discarded.
+"""
+
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from logging import getLogger
+from threading import BoundedSemaphore, Lock
+from time import monotonic
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from peewee import Model
+
+from mdb.orm import Address
+from mdb.orm import Company
+from mdb.orm import Customer
+from mdb.orm import Department
+from mdb.orm import Employee
+from mdb.rows import Row, rows
+
+
+__all__ = ["MODELS", "Hit", "Result", "search"]
+
+
+MODELS = [Customer, Company, Employee, Address, Department]
+LIMIT = 25
+TIMEOUT = 2.0
+WORKERS = len(MODELS)
+MAX_POOLS = 4
+LOGGER = getLogger("mdb.search")
+IDLE: list[ThreadPoolExecutor] = []
+LOCK = Lock()
+POOLS = BoundedSemaphore(MAX_POOLS)
+EXACT = 3
+PREFIX = 2
+CONTAINED = 1
+TEXTS: dict[type[Model], Callable[[Row], Iterable[str]]] = {
+    Customer: lambda row: (str(row.id), row.abbreviation, row.company.name),
+    Company: lambda row: (row.name,),
+    Employee: lambda row: (str(row), row.surname, row.email),
+    Address: lambda row: (row.street, row.zip_code, row.city, row.street_houseno),
+    Department: lambda row: (row.name, row.type),
+}
+
+
+class Hit(NamedTuple):
+    """A found record and its relevance."""
+
+    model: type[Model]
+    row: Row
+    score: int
+
+
+class Result(NamedTuple):
+    """Result of a search."""
+
+    hits: list[Hit]
+    incomplete: list[type[Model]]
+
+
+def _score(pattern: str, texts: Iterable[str]) -> int:
+    """Scores how well the texts match the pattern."""
+
+    pattern = pattern.casefold()
+    score = 0
+
+    for text in filter(None, texts):
+        if (text := text.casefold()) == pattern:
+            return EXACT
+
+        if text.startswith(pattern):
+            score = max(score, PREFIX)
+        elif pattern in text:
+            score = max(score, CONTAINED)
+
+    return score
+
+
+def _find(model: type[Model], pattern: str, limit: int) -> list[Hit]:
+    """Finds and scores the records of the model."""
+
+    return [
+        Hit(model, row, _score(pattern, TEXTS[model](row)))
+        for row in rows(model.find(pattern).limit(limit))
+    ]
+
+
+def _acquire(timeout: float) -> Optional[ThreadPoolExecutor]:
+    """Returns an idle thread pool or a new one.
+
+    If MAX_POOLS pools are in use, waits up to the
+    timeout for one to be released, else returns None.
+    """
+
+    if not POOLS.acquire(timeout=timeout):
+        return None
+
+    with LOCK:
+        if IDLE:
+            return IDLE.pop()
+
+    return ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="mdb-search")
+
+
+def _release(executor: ThreadPoolExecutor, futures: Iterable[Future]) -> None:
+    """Returns the thread pool to the idle ones
+    once all of the futures are done.
+    """
+
+    pending = set(futures)
+
+    def done(future: Optional[Future]) -> None:
+        with LOCK:
+            pending.discard(future)
+
+            if pending:
+                return
+
+            IDLE.append(executor)
+
+        POOLS.release()
+
+    if not pending:
+        done(None)
+
+    for future in list(pending):
+        future.add_done_callback(done)
+
+
+def search(
+    pattern: str,
+    models: Iterable[type[Model]] = MODELS,
+    *,
+    limit: int = LIMIT,
+    timeout: float = TIMEOUT,
+) -> Result:
+    """Searches the models for the pattern concurrently.
+
+    Returns up to limit hits per model, ranked by their score
+    and the order of the models, and the models whose queries
+    failed or did not complete within the timeout.
+    """
+
+    deadline = monotonic() + timeout
+
+    if (executor := _acquire(timeout)) is None:
+        LOGGER.warning("No search pool available for: %s", pattern)
+        return Result([], list(models))
+
+    futures = {executor.submit(_find, model, pattern, limit): model for model in models}
+    _release(executor, futures)
+    done, pending = wait(futures, timeout=max(deadline - monotonic(), 0))
+
+    for future in pending:
+        future.cancel()
+
+    order = {model: index for index, model in enumerate(futures.values())}
+    hits = []
+    incomplete = [futures[future] for future in pending]
+
+    for future in done:
+        if (error := future.exception()) is None:
+            hits.extend(future.result())
+        else:
+            LOGGER.error("Could not search %s: %s", futures[future].__name__, error)
+            incomplete.append(futures[future])
+
+    hits.sort(key=lambda hit: (-hit.score, order[hit.model]))
+    incomplete.sort(key=order.get)
+    return Result(hits, incomplete)
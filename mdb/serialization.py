@@ -0,0 +1,124 @@
+"""Precompiled JSON serialization of MDB records."""
+
+from __future__ import annotations
+from functools import cache
+from json import dumps as _json_dumps
+from operator import attrgetter
+from typing import Any, Callable, Iterable
+
+from peewee import Field, ForeignKeyField, Model, ModelSelect
+
+from mdb.rows import rows
+
+try:
+    from orjson import dumps as _orjson_dumps
+except ModuleNotFoundError:
+    _orjson_dumps = None
+
+
+__all__ = ["attribute", "dumps", "encode", "json_key", "serializer", "to_json"]
+
+
+Serializer = Callable[[Any], dict]
+
+
+def _camel_case(name: str) -> str:
+    """Converts a snake_case name into camelCase."""
+
+    first, *others = name.split("_")
+    return first + "".join(other.capitalize() for other in others)
+
+
+def json_key(field: Field) -> str:
+    """Returns the JSON key of the given field."""
+
+    return getattr(field, "json_key", None) or _camel_case(field.name)
+
+
+def attribute(field: Field) -> str:
+    """Returns the name of the attribute holding the field's raw value."""
+
+    if isinstance(field, ForeignKeyField):
+        return field.object_id_name
+
+    return field.name
+
+
+@cache
+def serializer(model: type[Model], *, null: bool = False, **nested: bool) -> Serializer:
+    """Returns a serializer for records of the given model.
+
+    The serializer is compiled once per model and options and
+    converts model instances as well as rows into JSON-ish dicts.
+    Foreign keys whose name is set to True in nested are serialized
+    as the respective nested record, e.g. company=True for customers.
+    Nested records must have been selected, e.g. by a cascaded select.
+    Missing nested records retain their foreign key's value.
+    As all MDB columns hold JSON-native values, no conversion is done.
+    """
+
+    fields = model._meta.sorted_fields
+    keys = tuple(json_key(field) for field in fields)
+    getter = attrgetter(*map(attribute, fields))
+    related = tuple(
+        (
+            json_key(field),
+            attrgetter(field.name),
+            serializer(
+                field.rel_model,
+                null=null,
+                **{name: value for name, value in nested.items() if name != field.name},
+            ),
+        )
+        for field in fields
+        if isinstance(field, ForeignKeyField) and nested.get(field.name)
+    )
+
+    def serialize(record: Any) -> dict:
+        """Serializes the given record."""
+        if null:
+            json = dict(zip(keys, getter(record)))
+        else:
+            json = {
+                key: value
+                for key, value in zip(keys, getter(record))
+                if value is not None
+            }
+
+        for key, get, serialize_related in related:
+            # Unselected related records of model instances are their IDs.
+            if isinstance(value := get(record), (Model, tuple)):
+                json[key] = serialize_related(value)
+
+        return json
+
+    return serialize
+
+
+def encode(json: Any) -> bytes:
+    """Encodes a JSON-ish object into bytes.
+
+    Uses orjson if available and falls back to the standard library.
+    """
+
+    if _orjson_dumps is not None:
+        return _orjson_dumps(json)
+
+    return _json_dumps(json, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def to_json(records: Iterable[Any], model: type[Model], **options: bool) -> list[dict]:
+    """Serializes the given records of the model into a list of dicts."""
+
+    return list(map(serializer(model, **options), records))
+
+
+def dumps(select: ModelSelect, **options: bool) -> bytes:
+    """Serializes a whole result set into one JSON buffer.
+
+    The select must have been created by the respective model's select()
+    method, with cascading if nested records are requested, e.g.
+    dumps(Customer.select(cascade=True), company=True, address=True).
+    """
+
+    return encode(to_json(rows(select), select.model, **options))
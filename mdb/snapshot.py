@@ -0,0 +1,301 @@
+"""Memory-mapped read-only snapshots of customers, companies and addresses.
+
+A snapshot file consists of a header, three tables and a string table.
+Each table stores its sorted IDs as an array of 64 bit integers, followed
+by the fixed-size records in the same order. Strings are stored once in
+the string table and referenced by their index. All values are little
+endian. Snapshots are written to a temporary file which then atomically
+replaces the target file, so that readers can switch to a new snapshot
+by calling refresh().
+"""
+
+from __future__ import annotations
+from bisect import bisect_left
+from mmap import ACCESS_READ, mmap
+from os import chmod, fsync, replace, stat
+from pathlib import Path
+from struct import Struct
+from tempfile import NamedTemporaryFile
+from time import time
+from typing import Iterable, Iterator, Optional, Union
+
+from mdb.orm import Customer
+from mdb.rows import AddressRow, CompanyRow, CustomerRow, rows
+
+
+__all__ = ["Snapshot", "build"]
+
+
+MAGIC = b"MDBS"
+VERSION = 1
+NONE = -1
+NO_STRING = 0xFFFFFFFF
+HEADER = Struct("<4sH2xdQQQQQQQQ")
+ID = Struct("<q")
+OFFSET = Struct("<I")
+ADDRESS = Struct("<qIIIII")
+COMPANY = Struct("<qqII")
+CUSTOMER = Struct("<qqqII")
+
+
+class StringTable:
+    """Deduplicating string table."""
+
+    def __init__(self):
+        self.indices = {}
+
+    def add(self, string: Optional[str]) -> int:
+        """Adds a string and returns its index."""
+        if string is None:
+            return NO_STRING
+
+        if (index := self.indices.get(string)) is None:
+            index = self.indices[string] = len(self.indices)
+
+        return index
+
+    def to_bytes(self) -> bytes:
+        """Returns the offsets followed by the UTF-8 encoded strings."""
+        offsets = bytearray()
+        blob = bytearray()
+
+        for string in self.indices:
+            offsets += OFFSET.pack(len(blob))
+            blob += string.encode()
+
+        offsets += OFFSET.pack(len(blob))
+        return bytes(offsets + blob)
+
+
+def _optional(value: Optional[int]) -> int:
+    """Returns the value or the NONE marker."""
+
+    return NONE if value is None else value
+
+
+def _table(records: dict[int, tuple], struct: Struct) -> bytes:
+    """Returns the sorted IDs followed by the packed records."""
+
+    ids = sorted(records)
+    return b"".join(
+        [
+            *(ID.pack(ident) for ident in ids),
+            *(struct.pack(ident, *records[ident]) for ident in ids),
+        ]
+    )
+
+
+def dump(customers: Iterable[CustomerRow]) -> bytes:
+    """Returns the snapshot of the given cascaded customers."""
+
+    strings = StringTable()
+    addresses = {}
+    companies = {}
+    records = {}
+
+    for customer in customers:
+        records[customer.id] = (
+            customer.company_id,
+            _optional(customer.reseller_id),
+            strings.add(customer.abbreviation),
+            strings.add(customer.annotation),
+        )
+
+        if (company := customer.company) is None or company.id in companies:
+            continue
+
+        companies[company.id] = (
+            _optional(company.address_id),
+            strings.add(company.name),
+            strings.add(company.annotation),
+        )
+
+        if (address := company.address) is None or address.id in addresses:
+            continue
+
+        addresses[address.id] = (
+            strings.add(address.street),
+            strings.add(address.house_number),
+            strings.add(address.zip_code),
+            strings.add(address.city),
+            strings.add(address.district),
+        )
+
+    sections = [
+        _table(records, CUSTOMER),
+        _table(companies, COMPANY),
+        _table(addresses, ADDRESS),
+        strings.to_bytes(),
+    ]
+    counts = [len(records), len(companies), len(addresses), len(strings.indices)]
+    offset = HEADER.size
+    header = []
+
+    for section, count in zip(sections, counts):
+        header += [offset, count]
+        offset += len(section)
+
+    return b"".join([HEADER.pack(MAGIC, VERSION, time(), *header), *sections])
+
+
+def build(path: Union[Path, str]) -> None:
+    """Builds a snapshot of all customers and
+    atomically replaces the file at the given path.
+    """
+
+    path = Path(path)
+    data = dump(rows(Customer.select(cascade=True)))
+
+    with NamedTemporaryFile("wb", dir=path.parent, delete=False) as tmp:
+        tmp.write(data)
+        tmp.flush()
+        fsync(tmp.fileno())
+
+    chmod(tmp.name, 0o644)
+    replace(tmp.name, path)
+
+
+class Table:
+    """A memory-mapped table of a snapshot."""
+
+    def __init__(self, buffer: mmap, offset: int, count: int, struct: Struct):
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+        self.struct = struct
+        self.records = offset + count * ID.size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> int:
+        """Returns the ID at the given index."""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+
+        return ID.unpack_from(self.buffer, self.offset + index * ID.size)[0]
+
+    def __iter__(self) -> Iterator[int]:
+        """Yields the IDs."""
+        for index in range(self.count):
+            yield self[index]
+
+    def get(self, ident: int) -> Optional[tuple]:
+        """Returns the record with the given ID."""
+        index = bisect_left(self, ident)
+
+        if index == self.count or self[index] != ident:
+            return None
+
+        return self.struct.unpack_from(
+            self.buffer, self.records + index * self.struct.size
+        )
+
+
+class Snapshot:
+    """A read-only snapshot of customers, companies and addresses.
+
+    The file is memory-mapped, so its pages are
+    shared between processes, e.g. forked workers.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        self.path = Path(path)
+        self.inode = None
+        self.buffer = None
+        self.created = None
+        self.customers = self.companies = self.addresses = None
+        self.strings = None
+        self.open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def open(self) -> None:
+        """Maps the snapshot file into memory."""
+        with self.path.open("rb") as file:
+            buffer = mmap(file.fileno(), 0, access=ACCESS_READ)
+            inode = stat(file.fileno()).st_ino
+
+        magic, version, created, *sections = HEADER.unpack_from(buffer)
+
+        if magic != MAGIC or version != VERSION:
+            buffer.close()
+            raise ValueError(f"Invalid snapshot: {self.path}")
+
+        self.close()
+        self.buffer, self.inode, self.created = buffer, inode, created
+        self.customers = Table(buffer, *sections[0:2], CUSTOMER)
+        self.companies = Table(buffer, *sections[2:4], COMPANY)
+        self.addresses = Table(buffer, *sections[4:6], ADDRESS)
+        self.strings = sections[6:8]
+
+    def close(self) -> None:
+        """Unmaps the snapshot file."""
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+    def refresh(self) -> bool:
+        """Switches to a new snapshot file if the file was replaced.
+        Returns True iff a new snapshot was loaded.
+        """
+        if stat(self.path).st_ino == self.inode:
+            return False
+
+        self.open()
+        return True
+
+    def string(self, index: int) -> Optional[str]:
+        """Returns the string with the given index."""
+        if index == NO_STRING:
+            return None
+
+        offset, count = self.strings
+        start, end = (
+            OFFSET.unpack_from(self.buffer, offset + (index + i) * OFFSET.size)[0]
+            for i in range(2)
+        )
+        blob = offset + (count + 1) * OFFSET.size
+        return str(self.buffer[blob + start : blob + end], "utf-8")
+
+    def address(self, ident: Optional[int]) -> Optional[AddressRow]:
+        """Returns the address with the given ID."""
+        if ident is None or (record := self.addresses.get(ident)) is None:
+            return None
+
+        ident, *strings = record
+        return AddressRow(ident, *map(self.string, strings))
+
+    def company(self, ident: Optional[int]) -> Optional[CompanyRow]:
+        """Returns the company with the given ID."""
+        if ident is None or (record := self.companies.get(ident)) is None:
+            return None
+
+        ident, address, name, annotation = record
+        address = None if address == NONE else address
+        return CompanyRow(
+            ident,
+            self.string(name),
+            address,
+            self.string(annotation),
+            self.address(address),
+        )
+
+    def customer(self, ident: int) -> Optional[CustomerRow]:
+        """Returns the customer with the given ID."""
+        if (record := self.customers.get(ident)) is None:
+            return None
+
+        ident, company, reseller, abbreviation, annotation = record
+        return CustomerRow(
+            ident,
+            company,
+            None if reseller == NONE else reseller,
+            self.string(abbreviation),
+            self.string(annotation),
+            self.company(company),
+        )
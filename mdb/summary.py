@@ -0,0 +1,194 @@
+"""Denormalized summary of customers for listings.
+
+The summary holds one row per customer with its name, abbreviation,
+reseller, formatted address, state and the amounts of its tenements and
+resellees. Once registered, the hooks refresh the affected rows whenever
+customers, companies, addresses or tenements are saved or deleted through
+the models. When a tenement is moved to another customer, the summaries
+of both customers are refreshed. Bulk queries bypass the hooks, so call
+refresh() or refresh_addresses() for the affected records after them.
+Use rebuild() to create or fully rebuild the summary.
+"""
+
+from __future__ import annotations
+from threading import local
+from typing import Iterable, Iterator, Optional
+
+from peewee import CharField, IntegerField, fn
+
+from mdb.functions import batches
+from mdb.orm import POST_DELETE, POST_SAVE, PRE_SAVE, MDBModel
+from mdb.orm import Address
+from mdb.orm import Company
+from mdb.orm import Customer
+from mdb.orm import Tenement
+from mdb.rows import from_tuples
+
+
+__all__ = [
+    "CustomerSummary",
+    "rebuild",
+    "refresh",
+    "refresh_addresses",
+    "register",
+]
+
+
+BATCH_SIZE = 1000
+PREVIOUS = local()
+
+
+class CustomerSummary(MDBModel):
+    """Summary of a customer."""
+
+    class Meta:
+        table_name = "customer_summary"
+
+    customer = IntegerField(primary_key=True, column_name="customer")
+    company = IntegerField(column_name="company", index=True)
+    address = IntegerField(column_name="address", null=True, index=True)
+    reseller = IntegerField(column_name="reseller", null=True, index=True)
+    name = CharField(255, index=True)
+    abbreviation = CharField(32, index=True)
+    oneliner = CharField(255, null=True)
+    state = CharField(32, null=True)
+    tenements = IntegerField(default=0)
+    resellees = IntegerField(default=0)
+
+
+def _summaries(customers: Optional[Iterable[int]] = None) -> Iterator[dict]:
+    """Yields the summaries of the given or all customers."""
+
+    resellee = Customer.alias()
+    tenements = Tenement.select(fn.COUNT(Tenement.id)).where(
+        Tenement.customer == Customer.id
+    )
+    resellees = resellee.select(fn.COUNT(resellee.id)).where(
+        resellee.reseller == Customer.id
+    )
+    select = Customer.select(tenements, resellees, cascade=True)
+
+    if customers is not None:
+        select = select.where(Customer.id << list(customers))
+
+    for record in select.tuples().iterator():
+        customer = next(from_tuples(Customer, [record]))
+        address = customer.company.address
+        yield {
+            CustomerSummary.customer: customer.id,
+            CustomerSummary.company: customer.company_id,
+            CustomerSummary.address: customer.company.address_id,
+            CustomerSummary.reseller: customer.reseller_id,
+            CustomerSummary.name: customer.company.name,
+            CustomerSummary.abbreviation: customer.abbreviation,
+            CustomerSummary.oneliner: None if address is None else address.oneliner,
+            CustomerSummary.state: None if address is None else address.state_name,
+            CustomerSummary.tenements: record[-2],
+            CustomerSummary.resellees: record[-1],
+        }
+
+
+def refresh(*customers: int) -> None:
+    """Refreshes the summaries of the given customers."""
+
+    if not (customers := {ident for ident in customers if ident is not None}):
+        return
+
+    with CustomerSummary._meta.database.atomic():
+        CustomerSummary.delete().where(
+            CustomerSummary.customer << list(customers)
+        ).execute()
+
+        for batch in batches(_summaries(customers), BATCH_SIZE):
+            CustomerSummary.insert_many(batch).execute()
+
+
+def rebuild(batch_size: int = BATCH_SIZE) -> None:
+    """Creates the summary table if it does not
+    exist and rebuilds the summaries of all customers.
+    """
+
+    CustomerSummary.create_table(safe=True)
+
+    with CustomerSummary._meta.database.atomic():
+        CustomerSummary.delete().execute()
+
+        for batch in batches(_summaries(), batch_size):
+            CustomerSummary.insert_many(batch).execute()
+
+
+def _referencing(field: IntegerField, *idents: int) -> Iterator[int]:
+    """Yields the customers whose summary references any of the IDs."""
+
+    select = CustomerSummary.select(CustomerSummary.customer).where(
+        field << list(idents)
+    )
+    return (customer for (customer,) in select.tuples())
+
+
+def refresh_addresses(*addresses: int) -> None:
+    """Refreshes the summaries referencing the given addresses,
+    e.g. after their references have been repointed.
+    """
+
+    if addresses:
+        refresh(*_referencing(CustomerSummary.address, *addresses))
+
+
+def _resellers(customer: int) -> Iterator[int]:
+    """Yields the reseller of the customer as stored in the summary."""
+
+    select = CustomerSummary.select(CustomerSummary.reseller).where(
+        CustomerSummary.customer == customer
+    )
+    return (reseller for (reseller,) in select.tuples())
+
+
+def _refresh_affected(record: MDBModel) -> None:
+    """Refreshes the summaries affected by the changed record."""
+
+    if isinstance(record, Customer):
+        refresh(record.id, record.reseller_id, *_resellers(record.id))
+    elif isinstance(record, Company):
+        refresh(*_referencing(CustomerSummary.company, record.id))
+    elif isinstance(record, Address):
+        refresh(*_referencing(CustomerSummary.address, record.id))
+    elif isinstance(record, Tenement):
+        refresh(record.customer_id)
+
+
+def _saving(record: MDBModel, fields: frozenset[str]) -> None:
+    """Remembers the previous customer of a tenement being moved."""
+
+    if not isinstance(record, Tenement) or record.id is None:
+        return
+
+    if "customer" in fields:
+        PREVIOUS.customer = (
+            Tenement.select(Tenement.customer).where(Tenement.id == record.id).scalar()
+        )
+
+
+def _saved(record: MDBModel, _: frozenset[str]) -> None:
+    """Refreshes the summaries affected by the saved record
+    including the previous customer of a moved tenement.
+    """
+
+    _refresh_affected(record)
+
+    if isinstance(record, Tenement):
+        refresh(getattr(PREVIOUS, "customer", None))
+        PREVIOUS.customer = None
+
+
+def register() -> None:
+    """Registers the hooks to maintain the summary."""
+
+    if _saving not in PRE_SAVE:
+        PRE_SAVE.append(_saving)
+
+    if _saved not in POST_SAVE:
+        POST_SAVE.append(_saved)
+
+    if _refresh_affected not in POST_DELETE:
+        POST_DELETE.append(_refresh_affected)
@@ -0,0 +1,249 @@
+"""Checksum-based incremental synchronization of MDB tables.
+
+The primary key space of each table is split into ranges, whose row
+counts and XOR-ed CRC32 checksums are compared between the source and
+the target database. Differing ranges are split up recursively until
+they reach the leaf size. Only the rows of differing leaf ranges are
+transferred and applied to the target in batches.
+
+On MySQL databases the checksums are computed server-side.
+Other databases compute them locally, assuming UTF-8 encoded columns.
+"""
+
+from __future__ import annotations
+from logging import getLogger
+from typing import Iterable, Iterator, NamedTuple
+from zlib import crc32
+
+from peewee import SQL, Database, Expression, Model, fn
+
+from mdb.functions import batches, is_mysql
+from mdb.orm import Address
+from mdb.orm import Company
+from mdb.orm import Customer
+from mdb.orm import Department
+from mdb.orm import Employee
+from mdb.orm import Tenement
+
+
+__all__ = ["MODELS", "Diff", "checksums", "diff", "sync"]
+
+
+LOGGER = getLogger("mdb.sync")
+MODELS = [Address, Company, Department, Employee, Customer, Tenement]
+NULL = "\\N"
+SEPARATOR = "|"
+FANOUT = 16
+LEAF_SIZE = 256
+BATCH_SIZE = 1000
+
+
+class Diff(NamedTuple):
+    """Differences of a table between the source and the target."""
+
+    model: type[Model]
+    ranges: int
+    upserts: list[tuple]
+    deletes: list[int]
+
+
+def _in_range(model: type[Model], start: int, stop: int) -> Expression:
+    """Returns a condition to select the primary key range."""
+
+    return (model._meta.primary_key >= start) & (model._meta.primary_key < stop)
+
+
+def _row_checksum(row: tuple) -> int:
+    """Returns the CRC32 checksum of a row as computed on MySQL."""
+
+    return crc32(
+        SEPARATOR.join(NULL if value is None else str(value) for value in row).encode()
+    )
+
+
+def checksums(
+    model: type[Model], database: Database, start: int, stop: int, size: int
+) -> dict[int, tuple[int, int]]:
+    """Returns the row count and checksum of each bucket
+    of the given size within the primary key range.
+    """
+
+    if not is_mysql(database):
+        result = {}
+        select = model.select(*model._meta.sorted_fields).where(
+            _in_range(model, start, stop)
+        )
+
+        for row in select.tuples().bind(database).iterator():
+            count, checksum = result.get(bucket := row[0] // size, (0, 0))
+            result[bucket] = (count + 1, checksum ^ _row_checksum(row))
+
+        return result
+
+    row = fn.CONCAT_WS(
+        SEPARATOR,
+        *(fn.COALESCE(field, NULL) for field in model._meta.sorted_fields),
+    )
+    select = (
+        model.select(
+            fn.FLOOR(model._meta.primary_key / size).alias("bucket"),
+            fn.COUNT(SQL("*")),
+            fn.BIT_XOR(fn.CRC32(row)),
+        )
+        .where(_in_range(model, start, stop))
+        .group_by(SQL("bucket"))
+    )
+    return {
+        int(bucket): (count, int(checksum))
+        for bucket, count, checksum in select.tuples().bind(database)
+    }
+
+
+def _max_id(model: type[Model], database: Database) -> int:
+    """Returns the highest primary key of the model's table."""
+
+    select = model.select(fn.MAX(model._meta.primary_key)).bind(database)
+    return select.scalar() or 0
+
+
+def _ranges(
+    model: type[Model],
+    source: Database,
+    target: Database,
+    start: int,
+    stop: int,
+    size: int,
+    leaf_size: int,
+) -> Iterator[tuple[int, int]]:
+    """Yields the differing leaf ranges within the primary key range."""
+
+    source_checksums = checksums(model, source, start, stop, size)
+    target_checksums = checksums(model, target, start, stop, size)
+
+    for bucket in sorted(source_checksums.keys() | target_checksums.keys()):
+        if source_checksums.get(bucket) == target_checksums.get(bucket):
+            continue
+
+        lower = bucket * size
+
+        if size <= leaf_size:
+            yield lower, lower + size
+        else:
+            yield from _ranges(
+                model,
+                source,
+                target,
+                lower,
+                lower + size,
+                max(size // FANOUT, leaf_size),
+                leaf_size,
+            )
+
+
+def _rows(
+    model: type[Model], database: Database, start: int, stop: int
+) -> dict[int, tuple]:
+    """Returns the rows within the given range by their primary key."""
+
+    select = model.select(*model._meta.sorted_fields).where(
+        _in_range(model, start, stop)
+    )
+    return {row[0]: row for row in select.tuples().bind(database)}
+
+
+def _upsert(model: type[Model], database: Database, rows: list[tuple]) -> None:
+    """Inserts or updates the given rows."""
+
+    fields = model._meta.sorted_fields
+    insert = model.insert_many(rows, fields=fields)
+
+    if is_mysql(database):
+        insert = insert.on_conflict(preserve=fields[1:])
+    else:
+        insert = insert.on_conflict(
+            conflict_target=[model._meta.primary_key], preserve=fields[1:]
+        )
+
+    insert.bind(database).execute()
+
+
+def diff(
+    model: type[Model],
+    target: Database,
+    *,
+    source: Database = None,
+    leaf_size: int = LEAF_SIZE,
+) -> Diff:
+    """Determines the rows of the model's table to be upserted
+    or deleted on the target database to match the source database.
+
+    The source defaults to the MDB database.
+    """
+
+    source = source or model._meta.database
+    stop = max(_max_id(model, source), _max_id(model, target)) + 1
+    size = leaf_size
+
+    while size * FANOUT < stop:
+        size *= FANOUT
+
+    ranges = list(_ranges(model, source, target, 0, stop, size, leaf_size))
+    upserts, deletes = [], []
+
+    for start, stop in ranges:
+        source_rows = _rows(model, source, start, stop)
+        target_rows = _rows(model, target, start, stop)
+        upserts += [
+            row for ident, row in source_rows.items() if target_rows.get(ident) != row
+        ]
+        deletes += [ident for ident in target_rows if ident not in source_rows]
+
+    return Diff(model, len(ranges), upserts, deletes)
+
+
+def sync(
+    target: Database,
+    models: Iterable[type[Model]] = MODELS,
+    *,
+    source: Database = None,
+    leaf_size: int = LEAF_SIZE,
+    batch_size: int = BATCH_SIZE,
+    dry_run: bool = False,
+) -> list[Diff]:
+    """Synchronizes the models' tables from the source to the target database.
+
+    The models must be given in order of their dependencies. Upserts are
+    applied in this order and deletions in reverse order, each batch of
+    rows in its own transaction.
+    """
+
+    diffs = [
+        diff(model, target, source=source, leaf_size=leaf_size) for model in models
+    ]
+
+    for result in diffs:
+        LOGGER.info(
+            "%s: %i differing ranges, %i upserts, %i deletes.",
+            result.model.__name__,
+            result.ranges,
+            len(result.upserts),
+            len(result.deletes),
+        )
+
+    if dry_run:
+        return diffs
+
+    for result in diffs:
+        for batch in batches(result.upserts, batch_size):
+            with target.atomic():
+                _upsert(result.model, target, batch)
+
+    for result in reversed(diffs):
+        primary_key = result.model._meta.primary_key
+
+        for batch in batches(result.deletes, batch_size):
+            with target.atomic():
+                delete = result.model.delete().where(primary_key << batch)
+                delete.bind(target).execute()
+
+    return diffs
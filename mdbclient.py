@@ -0,0 +1,92 @@
+"""Thin client forwarding find requests to a running mdbmgr server.
+
+This module is the entry point of the mdbmgr. It lives outside of the mdb
+package and only depends on the standard library, so that forwarding
+requests does not import the ORM or load the database configuration.
+Other requests are processed by the commands of mdb.mgr.
+"""
+
+from os import environ
+from pathlib import Path
+from shlex import join
+from socket import AF_UNIX, SOCK_STREAM, socket
+from sys import argv, stderr
+from typing import Iterable, Iterator, Optional, Sequence
+
+
+__all__ = ["ERROR", "SOCKET_VARIABLE", "forward", "main", "request"]
+
+
+SOCKET_VARIABLE = "MDBMGR_SOCKET"
+ERROR = "ERROR\t"
+
+
+def _read_response(lines: Iterable[str]) -> Iterator[str]:
+    """Yields the lines of a response up to the terminating empty line."""
+
+    for line in lines:
+        if not (line := line.rstrip("\n")):
+            return
+
+        yield line
+
+
+def request(argv: Sequence[str], path: Optional[Path] = None) -> Iterator[str]:
+    """Sends the arguments to the server and yields the response lines.
+
+    The socket path defaults to the one in the environment variable.
+    """
+
+    if path is None:
+        path = Path(environ[SOCKET_VARIABLE])
+
+    with socket(AF_UNIX, SOCK_STREAM) as client:
+        client.connect(str(path))
+        client.sendall(f"{join(argv)}\n".encode())
+
+        with client.makefile("r", encoding="utf-8") as file:
+            yield from _read_response(file)
+
+
+def forward(argv: Sequence[str]) -> bool:
+    """Forwards find requests to the server, if configured via the
+    environment variable, and prints the response.
+    Returns False if the request must be processed locally.
+    """
+
+    if SOCKET_VARIABLE not in environ or argv[:1] != ["find"]:
+        return False
+
+    if {"-h", "--help", "--explain", "--profile"} & set(argv):
+        return False
+
+    response = request(argv)
+
+    try:
+        line = next(response, None)
+    except OSError:
+        return False
+
+    if line is not None and line.startswith(ERROR):
+        print(line[len(ERROR) :], file=stderr)
+        raise SystemExit(1)
+
+    if line is not None:
+        print(line)
+
+    for line in response:
+        print(line)
+
+    return True
+
+
+def main() -> None:
+    """Runs the mdbmgr."""
+
+    if forward(argv[1:]):
+        return
+
+    # Import the commands only if the request was not forwarded.
+    from mdb.mgr.commands import run  # pylint: disable=C0415
+
+    run()
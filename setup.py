@@ -9,11 +9,13 @@ setup(
     use_scm_version={"local_scheme": "node-and-timestamp"},
     setup_requires=["setuptools_scm"],
     install_requires=["configlib", "peewee", "peeweeplus"],
+    extras_require={"fast": ["orjson"]},
     author="HOMEINFO - Digitale Informationssysteme GmbH",
     author_email="info@homeinfo.de",
     maintainer="Richard Neumann",
     maintainer_email="r.neumann@homeinfo.de",
     packages=["mdb", "mdb.mgr"],
-    entry_points={"console_scripts": ["mdbmgr = mdb.mgr:main"]},
+    py_modules=["mdbclient"],
+    entry_points={"console_scripts": ["mdbmgr = mdbclient:main"]},
     description="HOMEINFO Master Database ORM.",
 )